@@ -7,7 +7,10 @@ from .direction import Direction
 
 class FlexLayout:
 
-    def __init__(self, origin, axis, direction, boundary, gap=None):
+    # Most plans kept before starting over.
+    default_max_plans = 128
+
+    def __init__(self, origin, axis, direction, boundary, gap=None, max_plans=None):
         self.origin = origin
         self.axis = Axis(axis)
         self.direction = Direction(direction)
@@ -16,6 +19,14 @@ class FlexLayout:
             gap = (0, 0)
         self.gap = gap
 
+        if max_plans is None:
+            max_plans = self.default_max_plans
+        self.max_plans = max_plans
+        # Positions for each tuple of sizes, for the configuration they were
+        # computed with.
+        self.plans = {}
+        self.plan_config = None
+
     @property
     def gap_x(self):
         # XXX: Dependency for AlignmentAttributes
@@ -66,7 +77,7 @@ class FlexLayout:
         return cls.from_rect(container, Axis.VERTICAL, direction, gap=gap)
 
     def update_for_direction(self, rect1, rect2):
-        if Axis(self.axis) == Axis.HORIZONTAL:
+        if self.axis == Axis.HORIZONTAL:
             rect2.left = rect1.right + self.gap[0]
             rect2.top = rect1.top
         else:
@@ -95,6 +106,46 @@ class FlexLayout:
         """
         Layout rects wrapping inside this container horizontally. Allows None
         in rect list for empty slots.
+
+        Positions only depend on the sizes, so they are computed once per
+        tuple of sizes and copied onto the rects after that.
+        """
+        key = tuple(None if rect is None else rect.size for rect in rects)
+        if None in key[1:]:
+            # A rect after an empty slot keeps its position and the rects
+            # after it follow from there, the plan would depend on it.
+            self.layout(rects)
+            return
+
+        config = (tuple(self.origin), self.axis, self.direction, self.boundary, tuple(self.gap))
+        if config != self.plan_config:
+            self.plans.clear()
+            self.plan_config = config
+
+        plan = self.plans.get(key)
+        if plan is None:
+            if len(self.plans) >= self.max_plans:
+                self.plans.clear()
+            plan = self.plans[key] = self.compile(key)
+
+        for rect, position in zip(rects, plan):
+            if rect is not None:
+                rect.topleft = position
+
+    def compile(self, sizes):
+        """
+        Return the top left position of each size laid out.
+        """
+        rects = [
+            None if size is None else pygame.Rect((0, 0), size)
+            for size in sizes
+        ]
+        self.layout(rects)
+        return tuple(None if rect is None else rect.topleft for rect in rects)
+
+    def layout(self, rects):
+        """
+        Layout rects in place.
         """
         sizes = [rect.size for rect in rects if rect is not None]
         if not sizes:
@@ -104,12 +155,13 @@ class FlexLayout:
         anchor, rects = self._get_anchor_and_rects(rects, sizes)
         gap_x, gap_y = self.gap
 
-        direction = Direction(self.direction)
+        direction = self.direction
         paired_rects = zip(rects, rects[1:])
 
         boundary_op = operator.gt if direction == Direction.FORWARD else operator.lt
 
-        axis = Axis(self.axis)
+        axis = self.axis
+        alignment_attributes = alignment_attr_map[(axis, direction)]
         for r1, r2 in paired_rects:
             # Skip pair for either is None.
             if r1 is None or r2 is None:
@@ -141,7 +193,6 @@ class FlexLayout:
                 anchor = r2
             else:
                 # No wrap, normal flow.
-                alignment_attributes = alignment_attr_map[(axis, direction)]
                 alignment_attributes.update_with_gap(r1, r2, self)
                 alignment_attributes.update_no_gap(r1, r2)
 
@@ -1,15 +1,30 @@
 import argparse
+import importlib
 import os
+import sys
 
 from .game import Scoundrel
-from .view import AssetBrowser
-from .view import ScoundrelPygame
-from .view import ScoundrelTUI
 
-def argument_parser():
+# Subcommand to the module and class that adds its subparser. Only the chosen
+# subcommand's module is imported, so headless commands never import pygame.
+subcommands = {
+    'text': ('scoundrel.view.text', 'ScoundrelTUI'),
+    'pygame': ('scoundrel.view.pygame.user_interface', 'ScoundrelPygame'),
+    'assets': ('scoundrel.view.pygame.browser', 'AssetBrowser'),
+    'simulate': ('scoundrel.simulate', 'Simulation'),
+    'solve': ('scoundrel.solver', 'Solver'),
+    'replay': ('scoundrel.replay', 'ReplayVerifier'),
+    'bench': ('scoundrel.bench', 'Bench'),
+}
+
+def subcommand_class(name):
     """
-    Create argument parser.
+    Import and return the class of a subcommand.
     """
+    module_name, class_name = subcommands[name]
+    return getattr(importlib.import_module(module_name), class_name)
+
+def base_parser():
     prog = os.path.basename(os.path.dirname(__file__))
 
     parser = argparse.ArgumentParser(
@@ -17,10 +32,39 @@ def argument_parser():
         prog = prog,
     )
     Scoundrel.add_arguments(parser)
+    return parser
+
+def chosen_subcommand(argv):
+    """
+    Name of the subcommand in argv, parsed against placeholder subparsers.
+    Exits like parse_args for help or no subcommand.
+    """
+    parser = base_parser()
+    subparsers = parser.add_subparsers(
+        title = 'interface',
+        dest = 'interface',
+        required = True,
+    )
+    for name in subcommands:
+        subparsers.add_parser(name, add_help=False)
+    args, _ = parser.parse_known_args(argv)
+    return args.interface
+
+def argument_parser(argv=None):
+    """
+    Create argument parser, with the full subparser of the subcommand in argv
+    and placeholders for the rest.
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    chosen = chosen_subcommand(argv)
 
+    parser = base_parser()
     subparsers = parser.add_subparsers(title='interface', required=True)
-    ScoundrelTUI.add_subparser(subparsers)
-    ScoundrelPygame.add_subparser(subparsers)
-    AssetBrowser.add_subparser(subparsers)
+    for name in subcommands:
+        if name == chosen:
+            subcommand_class(name).add_subparser(subparsers)
+        else:
+            subparsers.add_parser(name)
 
     return parser
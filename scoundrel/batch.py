@@ -0,0 +1,265 @@
+import numpy as np
+
+from .card import ScoundrelCard
+from .card import card_ids
+from .card import cards
+from .game import Scoundrel
+from .simulate import SimulationResult
+
+# Decision to run from the room, after the room slots.
+RUN = Scoundrel.FULL_ROOM_SIZE
+
+# Weakest value of a weapon that has not slain a monster, greater than any
+# monster so Scoundrel.is_weapon_usable allows it.
+FRESH = 15
+
+EMPTY = -1
+
+card_values = np.array([card.game_value for card in cards], dtype=np.int16)
+card_is_monster = np.array([card.is_monster for card in cards])
+card_is_weapon = np.array([card.is_weapon for card in cards])
+card_is_health = np.array([card.is_health for card in cards])
+
+class BatchScoundrel:
+    """
+    Many games of scoundrel held as NumPy arrays and advanced in lockstep, one
+    decision per game per step. Outcomes are identical to Scoundrel for the
+    same dungeons and choices.
+
+    Decisions are room slot indexes or RUN. Room slots keep the order of
+    Scoundrel's room deck with played cards leaving EMPTY slots.
+    """
+
+    def __init__(self, dungeons, god_mode=False):
+        """
+        dungeons is a (games, cards) array of card ids in the order of
+        Scoundrel's dungeon deck, top card last.
+        """
+        dungeons = np.asarray(dungeons, dtype=np.int16)
+        ngames, self.size = dungeons.shape
+        self.god_mode = god_mode
+
+        # Ring buffer of each dungeon in draw order.
+        self.queue = np.ascontiguousarray(dungeons[:, ::-1])
+        self.head = np.zeros(ngames, dtype=np.int16)
+        self.count = np.full(ngames, self.size, dtype=np.int16)
+
+        self.room = np.full((ngames, Scoundrel.FULL_ROOM_SIZE), EMPTY, dtype=np.int16)
+        self.room_count = np.zeros(ngames, dtype=np.int16)
+        self.weapon = np.zeros(ngames, dtype=np.int16)
+        self.weakest = np.full(ngames, FRESH, dtype=np.int16)
+        self.health = np.full(ngames, Scoundrel.MAX_HEALTH, dtype=np.int16)
+        self.avoided = np.zeros(ngames, dtype=bool)
+        self.turns = np.zeros(ngames, dtype=np.int32)
+
+        self.playing = self.count > 0
+        self._refill(np.nonzero(self.playing)[0])
+
+    @classmethod
+    def from_cards(cls, dungeons, god_mode=False):
+        """
+        Batch from lists of ScoundrelCard dungeons of equal length.
+        """
+        ids = [[card_ids[card] for card in dungeon] for dungeon in dungeons]
+        return cls(ids, god_mode=god_mode)
+
+    @staticmethod
+    def random_dungeons(rng, ngames, dungeon):
+        """
+        Return (ngames, cards) array of independent shuffles of a dungeon from
+        a numpy Generator.
+        """
+        ids = np.array([card_ids[card] for card in dungeon], dtype=np.int16)
+        return rng.permuted(np.tile(ids, (ngames, 1)), axis=1)
+
+    @property
+    def ngames(self):
+        return len(self.health)
+
+    @property
+    def is_playing(self):
+        return bool(self.playing.any())
+
+    @property
+    def won(self):
+        alive = self.health > 0
+        if self.god_mode:
+            alive[:] = True
+        return ~self.playing & alive
+
+    def choices(self):
+        """
+        Return (games, slots + 1) boolean array of available decisions.
+        """
+        choices = np.zeros((self.ngames, RUN + 1), dtype=bool)
+        choices[:, :RUN] = (self.room != EMPTY) & self.playing[:, None]
+        choices[:, RUN] = (
+            self.playing
+            & ~self.avoided
+            & (self.room_count == Scoundrel.FULL_ROOM_SIZE)
+        )
+        return choices
+
+    def step(self, decisions):
+        """
+        Apply one decision for each game in play. Decisions of finished games
+        are ignored.
+        """
+        decisions = np.asarray(decisions)
+        games = np.arange(self.ngames)
+        in_range = (decisions >= 0) & (decisions <= RUN)
+        available = self.choices()[games, np.where(in_range, decisions, 0)] & in_range
+        if np.any(self.playing & ~available):
+            raise ValueError('Decision is not available for a game in play.')
+
+        self.turns += self.playing
+        run = self.playing & (decisions == RUN)
+        play = self.playing & ~run
+        if run.any():
+            self._run(np.nonzero(run)[0])
+        if play.any():
+            self._play(np.nonzero(play)[0], decisions[play])
+
+        # Next room for games down to their last card.
+        refill = self.playing & (self.room_count <= 1)
+        if refill.any():
+            self._refill(np.nonzero(refill)[0])
+
+    def play(self, policy, rng=None):
+        """
+        Step all games to the end with policy(batch, rng) returning decisions.
+        """
+        while self.is_playing:
+            self.step(policy(self, rng))
+
+    def _run(self, games):
+        """
+        Place rooms under their dungeons in order.
+        """
+        for slot in range(Scoundrel.FULL_ROOM_SIZE):
+            tail = (self.head[games] + self.count[games] + slot) % self.size
+            self.queue[games, tail] = self.room[games, slot]
+        self.count[games] += Scoundrel.FULL_ROOM_SIZE
+        self.room[games] = EMPTY
+        self.room_count[games] = 0
+        self.avoided[games] = True
+
+    def _play(self, games, slots):
+        card = self.room[games, slots]
+        value = card_values[card]
+        is_monster = card_is_monster[card]
+        is_weapon = card_is_weapon[card]
+        is_health = card_is_health[card]
+        health = self.health[games]
+        weapon = self.weapon[games]
+        weakest = self.weakest[games]
+
+        # Same capped healing as Scoundrel.heal_value.
+        healed = np.minimum(value, Scoundrel.MAX_HEALTH - health)
+        health = np.where(is_health, health + healed, health)
+
+        armed = weapon > 0
+        usable = armed & Scoundrel.is_weapon_usable(value, weakest)
+        damage = np.where(
+            usable,
+            Scoundrel.damage_value(value, weapon),
+            Scoundrel.damage_value(value),
+        )
+        health = np.where(is_monster & (damage > 0), health - damage, health)
+        # Monsters fought with a weapon equipped go on the weapon.
+        weakest = np.where(is_monster & armed, np.minimum(weakest, value), weakest)
+
+        weapon = np.where(is_weapon, value, weapon)
+        weakest = np.where(is_weapon, FRESH, weakest)
+
+        self.health[games] = health
+        self.weapon[games] = weapon
+        self.weakest[games] = weakest
+        self.room[games, slots] = EMPTY
+        self.room_count[games] -= 1
+
+        if not self.god_mode:
+            dead = games[health <= 0]
+            self.playing[dead] = False
+
+    def _refill(self, games):
+        """
+        Draw new rooms, the leftover card first like Scoundrel's room deck.
+        Games whose draw empties the dungeon are over.
+        """
+        room = self.room[games]
+        order = np.argsort(room == EMPTY, axis=1, kind='stable')
+        room = np.take_along_axis(room, order, axis=1)
+        have = self.room_count[games]
+        head = self.head[games]
+        draw = np.minimum(Scoundrel.FULL_ROOM_SIZE - have, self.count[games])
+        for slot in range(Scoundrel.FULL_ROOM_SIZE):
+            offset = slot - have
+            take = (offset >= 0) & (offset < draw)
+            position = (head + offset) % self.size
+            room[:, slot] = np.where(take, self.queue[games, position], room[:, slot])
+
+        self.room[games] = room
+        self.room_count[games] = have + draw
+        self.head[games] = (head + draw) % self.size
+        self.count[games] -= draw
+        self.playing[games[self.count[games] == 0]] = False
+
+
+def greedy_policy(batch, rng=None):
+    """
+    Decisions of policy.GreedyPolicy for every game.
+    """
+    decisions = np.zeros(batch.ngames, dtype=np.intp)
+    games = np.nonzero(batch.playing)[0]
+    room = batch.room[games]
+    filled = room != EMPTY
+    card = np.where(filled, room, 0)
+    value = card_values[card]
+    weapon = batch.weapon[games, None]
+    weakest = batch.weakest[games, None]
+    health = batch.health[games, None]
+
+    usable = (weapon > 0) & Scoundrel.is_weapon_usable(value, weakest)
+    damage = np.where(
+        usable,
+        Scoundrel.damage_value(value, weapon),
+        Scoundrel.damage_value(value),
+    )
+    cost = np.where(card_is_monster[card], np.maximum(damage, 0), 0)
+    cost = np.where(card_is_weapon[card], weapon - value, cost)
+    healed = np.minimum(value, Scoundrel.MAX_HEALTH - health)
+    cost = np.where(card_is_health[card], -healed, cost)
+    cost = np.where(filled, cost, np.iinfo(cost.dtype).max)
+    # argmin keeps the first of equal costs, room order breaks ties.
+    decisions[games] = np.argmin(cost, axis=1)
+    return decisions
+
+def random_policy(batch, rng):
+    """
+    Uniform choice among the available decisions of every game.
+    """
+    choices = batch.choices()
+    weights = rng.random(choices.shape) * choices
+    return np.argmax(weights, axis=1)
+
+
+batch_policies = {
+    'greedy': greedy_policy,
+    'random': random_policy,
+}
+
+def play_batch_chunk(chunk):
+    """
+    Play a chunk of simulation work in one batch. Dungeons are drawn from a
+    generator seeded by the chunk, so results depend on the chunk size but not
+    on the number of processes.
+    """
+    rng = np.random.default_rng([chunk.seed, chunk.start])
+    dungeon = ScoundrelCard.create_dungeon(half_monsters=chunk.half_monsters)
+    dungeons = BatchScoundrel.random_dungeons(rng, chunk.stop - chunk.start, dungeon)
+    batch = BatchScoundrel(dungeons, god_mode=chunk.god_mode)
+    batch.play(batch_policies[chunk.policy], rng)
+    result = SimulationResult()
+    result.add_batch(batch.won, batch.health, batch.turns)
+    return result
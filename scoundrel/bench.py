@@ -0,0 +1,433 @@
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import timeit
+
+from configparser import ConfigParser
+from configparser import ExtendedInterpolation
+from functools import partial
+
+from . import parse
+from .compact_deck import CompactDeckManager
+from .constant import CONFIG_KEY
+from .deck import Deck
+from .deck import DeckManager
+from .game import Scoundrel
+from .policy import GreedyPolicy
+from .rng import game_stream
+from .rng import shuffled_dungeon
+from .simulate import play_game
+
+class BenchmarkSkipped(Exception):
+    """
+    Raised by a benchmark setup that cannot run here.
+    """
+
+
+class BenchmarkFailed(Exception):
+    """
+    Raised by a benchmark, or its setup, whose work went wrong. Counted like
+    a regression.
+    """
+
+
+def first_choice(game, available_choices):
+    """
+    Scripted player taking the first available choice.
+    """
+    value, label = available_choices[0]
+    return value
+
+def config_parser(args):
+    """
+    Config of the pygame interface, or skip.
+    """
+    path = args.config or os.environ.get(CONFIG_KEY)
+    if not path:
+        raise BenchmarkSkipped(f'no config, use --config or {CONFIG_KEY}')
+    cp = ConfigParser(
+        interpolation = ExtendedInterpolation(),
+    )
+    cp.read(path)
+    return cp
+
+def import_pygame():
+    try:
+        from .external import pygame
+    except ImportError:
+        raise BenchmarkSkipped('pygame is not installed')
+    return pygame
+
+def bench_move_card(args, deck_manager_class=DeckManager):
+    decks = deck_manager_class(*Deck)
+    decks.set_deck(Deck.DUNGEON, shuffled_dungeon(game_stream(args.seed)))
+
+    def move_card():
+        card = decks.top_card(Deck.DUNGEON)
+        decks.move_card(card, Deck.DUNGEON, Deck.ROOM)
+        decks.move_card(card, Deck.ROOM, Deck.DUNGEON)
+
+    return (move_card, 'two moves')
+
+def bench_compact_move_card(args):
+    return bench_move_card(args, CompactDeckManager)
+
+def bench_loop_step(args):
+    game = Scoundrel(shuffled_dungeon(game_stream(args.seed)), first_choice)
+    start = game.snapshot()
+
+    def loop_step():
+        if not game.is_playing:
+            game.restore(start)
+        game.loop_step()
+
+    return (loop_step, 'room')
+
+def bench_game(args):
+    dungeons = [
+        shuffled_dungeon(game_stream(args.seed, index))
+        for index in range(100)
+    ]
+    policy = GreedyPolicy()
+    index = 0
+
+    def game():
+        nonlocal index
+        play_game(list(dungeons[index]), policy)
+        index = (index + 1) % len(dungeons)
+
+    return (game, 'game')
+
+def bench_flex_layout(args, nrects):
+    pygame = import_pygame()
+    from .align import FlexLayout
+
+    layout = FlexLayout.from_columns(
+        tile_width = 32,
+        ncols = 8,
+        gap = (4, 4),
+    )
+    rects = [pygame.Rect(0, 0, 32, 44) for _ in range(nrects)]
+
+    def flex_layout():
+        layout(rects)
+
+    return (flex_layout, 'layout')
+
+def bench_assets(args):
+    import_pygame()
+    from .view.pygame.assets import scoundrel_assets_from_config
+
+    cp = config_parser(args)
+
+    def load_assets():
+        # Sheets load lazily, time loading all of them.
+        scoundrel_assets_from_config(cp).prefetch()
+
+    return (load_assets, 'load')
+
+def bench_draw(args):
+    # Render without a window.
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import_pygame()
+    from .view.pygame.assets import scoundrel_assets_from_config
+    from .view.pygame.user_interface import ScoundrelPygame
+
+    cp = config_parser(args)
+    interface = ScoundrelPygame(scoundrel_assets_from_config(cp))
+    rng = game_stream(args.seed)
+    game = Scoundrel(shuffled_dungeon(rng), interface.prompt_for_turn, rng=rng)
+    interface.init_game(game)
+    game.init_room()
+    choices = game.choices_for_turn()
+    interface.layout_turn(game, choices)
+
+    def draw():
+        # Integer milliseconds like Clock.tick.
+        interface.update(1000 // interface.framerate, game)
+        interface.draw()
+
+    return (draw, 'frame')
+
+# Build the parser for a subcommand in a new interpreter and fail if that
+# imported pygame.
+startup_script = """
+import sys
+from scoundrel.argument_parser import argument_parser
+argument_parser(sys.argv[1:]).parse_args(sys.argv[1:])
+if 'pygame' in sys.modules:
+    sys.exit('imported pygame')
+"""
+
+def bench_startup(args, argv):
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        filter(None, [package_root, env.get('PYTHONPATH')]))
+    command = [sys.executable, '-c', startup_script] + argv
+
+    # Check the import budget once, before timing, so a leak is a failure
+    # of the benchmark rather than of a timing round.
+    process = subprocess.run(command, env=env, stderr=subprocess.PIPE, text=True)
+    if process.returncode:
+        # The last line of the error, like the message of sys.exit.
+        lines = process.stderr.strip().splitlines() or [f'exit {process.returncode}']
+        raise BenchmarkFailed(lines[-1])
+
+    def startup():
+        subprocess.run(command, env=env)
+
+    return (startup, 'start')
+
+
+benchmarks = {
+    'deck_manager.move_card': bench_move_card,
+    'compact_deck_manager.move_card': bench_compact_move_card,
+    'scoundrel.loop_step': bench_loop_step,
+    'scoundrel.game': bench_game,
+    'flex_layout.4': partial(bench_flex_layout, nrects=4),
+    'flex_layout.16': partial(bench_flex_layout, nrects=16),
+    'flex_layout.64': partial(bench_flex_layout, nrects=64),
+    'assets.load': bench_assets,
+    'pygame.draw': bench_draw,
+    'cli.startup.text': partial(bench_startup, argv=['text']),
+    'cli.startup.simulate': partial(bench_startup, argv=['simulate']),
+}
+
+# Most seconds a benchmark may take, checked on every run. Startup includes
+# the interpreter's own.
+budgets = {
+    'cli.startup.text': 0.2,
+    'cli.startup.simulate': 0.2,
+}
+
+class Bench:
+    """
+    Run benchmarks and compare them to a saved baseline.
+    """
+
+    default_repeat = 5
+    default_min_time = 0.2
+    default_seed = 0
+    default_threshold = 0.1
+
+    def __init__(
+        self,
+        names = None,
+        repeat = None,
+        min_time = None,
+        threshold = None,
+    ):
+        if names is None:
+            names = list(benchmarks)
+        self.names = names
+
+        if repeat is None:
+            repeat = self.default_repeat
+        self.repeat = repeat
+
+        if min_time is None:
+            min_time = self.default_min_time
+        self.min_time = min_time
+
+        if threshold is None:
+            threshold = self.default_threshold
+        self.threshold = threshold
+
+    @classmethod
+    def add_subparser(cls, subparsers):
+        """
+        Add subparser to run benchmarks.
+        """
+        subparser = subparsers.add_parser('bench')
+        subparser.add_argument(
+            '--filter',
+            help = 'Only run benchmarks with this in their name.',
+        )
+        subparser.add_argument(
+            '--repeat',
+            type = parse.positive_int,
+            default = cls.default_repeat,
+            help = 'Timing rounds per benchmark. Default: %(default)s',
+        )
+        subparser.add_argument(
+            '--min-time',
+            type = parse.positive_float,
+            default = cls.default_min_time,
+            help = 'Minimum seconds per round. Default: %(default)s',
+        )
+        subparser.add_argument(
+            '--output',
+            help = 'Write results as JSON to this path instead of stdout.',
+        )
+        subparser.add_argument(
+            '--compare',
+            help = 'Compare results to a saved JSON baseline.',
+        )
+        subparser.add_argument(
+            '--threshold',
+            type = float,
+            default = cls.default_threshold,
+            help = 'Fraction slower than the baseline that is a regression.'
+                ' Default: %(default)s',
+        )
+        subparser.add_argument(
+            '--config',
+            help = 'Path to config for the pygame benchmarks.',
+        )
+        subparser.set_defaults(func=run)
+
+    @classmethod
+    def from_args(cls, args):
+        names = [
+            name for name in benchmarks
+            if not args.filter or args.filter in name
+        ]
+        instance = cls(
+            names = names,
+            repeat = args.repeat,
+            min_time = args.min_time,
+            threshold = args.threshold,
+        )
+        return instance
+
+    def measure(self, func):
+        """
+        Return (number, times) of seconds per call over the rounds.
+        """
+        timer = timeit.Timer(func)
+        number = 1
+        while True:
+            elapsed = timer.timeit(number)
+            if elapsed >= self.min_time:
+                break
+            number *= 2
+        times = [elapsed / number]
+        for _ in range(self.repeat - 1):
+            times.append(timer.timeit(number) / number)
+        return (number, times)
+
+    def run(self, args):
+        """
+        Run the benchmarks and return the results for JSON.
+        """
+        results = {}
+        for name in self.names:
+            try:
+                func, unit = benchmarks[name](args)
+                number, times = self.measure(func)
+            except BenchmarkSkipped as skipped:
+                results[name] = {'skipped': str(skipped)}
+                continue
+            except BenchmarkFailed as failed:
+                results[name] = {'failed': str(failed)}
+                continue
+            best = min(times)
+            results[name] = {
+                'unit': unit,
+                'number': number,
+                'repeat': len(times),
+                'best': best,
+                'median': statistics.median(times),
+                'per_second': 1 / best,
+            }
+        return {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': args.seed,
+            'benchmarks': results,
+        }
+
+    def compare(self, baseline, current, stream=None):
+        """
+        Write a table of current against baseline best times and return the
+        names of regressions.
+        """
+        if stream is None:
+            stream = sys.stdout
+        regressions = []
+        baseline = baseline['benchmarks']
+        current = current['benchmarks']
+        for name, result in current.items():
+            old = baseline.get(name)
+            if 'failed' in result:
+                stream.write(f'{name:32} failed: {result["failed"]}\n')
+                regressions.append(name)
+                continue
+            if 'skipped' in result or not old or 'best' not in old:
+                stream.write(f'{name:32} skipped\n')
+                continue
+            ratio = result['best'] / old['best']
+            if ratio > 1 + self.threshold:
+                status = 'slower'
+                regressions.append(name)
+            elif ratio < 1 - self.threshold:
+                status = 'faster'
+            else:
+                status = 'same'
+            stream.write(
+                f'{name:32} {old["best"] * 1e6:12.2f}us'
+                f' {result["best"] * 1e6:12.2f}us {ratio:6.2f}x {status}\n')
+        return regressions
+
+    def over_budget(self, current, stream=None):
+        """
+        Write and return the names of benchmarks slower than their budget.
+        """
+        if stream is None:
+            stream = sys.stderr
+        over = []
+        for name, result in current['benchmarks'].items():
+            budget = budgets.get(name)
+            if budget is None or 'best' not in result:
+                continue
+            if result['best'] > budget:
+                over.append(name)
+                stream.write(
+                    f'{name}: {result["best"]:.3f}s over budget of {budget:.3f}s\n')
+        return over
+
+    def failures(self, current, stream=None):
+        """
+        Write and return the names of benchmarks that failed.
+        """
+        if stream is None:
+            stream = sys.stderr
+        failed = []
+        for name, result in current['benchmarks'].items():
+            if 'failed' in result:
+                failed.append(name)
+                stream.write(f'{name}: failed: {result["failed"]}\n')
+        return failed
+
+
+def run(args):
+    """
+    Run benchmarks from command line arguments.
+    """
+    bench = Bench.from_args(args)
+    if args.seed is None:
+        # Same work every run unless asked otherwise.
+        args.seed = bench.default_seed
+    results = bench.run(args)
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2)
+    elif not args.compare:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+
+    failed = bool(bench.failures(results))
+    if bench.over_budget(results):
+        failed = True
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        if bench.compare(baseline, results):
+            failed = True
+    if failed:
+        sys.exit(1)
@@ -1,4 +1,5 @@
 from collections import namedtuple
+from functools import cached_property
 from itertools import product
 
 from .rank import Rank
@@ -6,11 +7,21 @@ from .suit import Suit
 
 Card = namedtuple('Card', 'suit rank')
 
+# Interned dungeon cards by (suit, rank).
+interned_cards = {}
+
 class ScoundrelCard(Card):
     """
-    A card in a game of scoundrel.
+    A card in a game of scoundrel. Dungeon cards are interned with their
+    properties computed once.
     """
 
+    def __new__(cls, suit, rank):
+        card = interned_cards.get((suit, rank))
+        if card is None:
+            card = super().__new__(cls, suit, rank)
+        return card
+
     @staticmethod
     def is_scoundrel(rank, suit, half_monsters=False):
         """
@@ -39,28 +50,55 @@ class ScoundrelCard(Card):
             if ScoundrelCard.is_scoundrel(rank, suit, half_monsters=half_monsters)
         ]
 
-    @property
+    @cached_property
+    def card_id(self):
+        """
+        Index in cards, None for cards never in a dungeon.
+        """
+        return card_ids.get(self)
+
+    @cached_property
     def is_weapon(self):
         return self.suit.is_weapon
 
-    @property
+    @cached_property
     def is_health(self):
         return self.suit.is_health
 
-    @property
+    @cached_property
     def is_monster(self):
         return self.suit.is_monster
 
-    @property
+    @cached_property
     def game_string(self):
         """
         Return nice name to display.
         """
         return f'{self.suit.game_name.title()}({self.game_value})'
 
-    @property
+    @cached_property
     def game_value(self):
         """
         Return value used in the game of scoundrel.
         """
         return self.rank.value
+
+
+# Every card that can appear in a dungeon, identified by its index.
+cards = tuple(ScoundrelCard.create_dungeon())
+card_ids = {card: card_id for card_id, card in enumerate(cards)}
+
+cached_properties = (
+    'card_id',
+    'is_weapon',
+    'is_health',
+    'is_monster',
+    'game_value',
+    'game_string',
+)
+
+for card in cards:
+    # Cache the properties now, so they are plain attribute lookups.
+    for name in cached_properties:
+        getattr(card, name)
+    interned_cards[card] = card
@@ -0,0 +1,74 @@
+from .card import ScoundrelCard
+from .game import Scoundrel
+
+# Coded game state shared by the solver and mcts: cards as small ints and the
+# player as (weapon, weakest, health).
+
+MONSTER = 0
+WEAPON = 1
+HEALTH = 2
+
+# Weakest value of a weapon that has not slain a monster, greater than any
+# monster so Scoundrel.is_weapon_usable allows it.
+FRESH = 15
+
+# Choice to run from the room.
+RUN = -1
+
+MIN_MONSTER = min(
+    card.game_value for card in ScoundrelCard.create_dungeon() if card.is_monster)
+
+def card_code(card):
+    """
+    Small int for a card. Cards of the same kind and value play identically
+    and share a code, so equal cards transpose in the search.
+    """
+    if card.is_health:
+        kind = HEALTH
+    elif card.is_weapon:
+        kind = WEAPON
+    else:
+        kind = MONSTER
+    return kind * 16 + card.game_value
+
+def play_code(code, weapon, weakest, health):
+    """
+    Apply a coded card to compact player state and return the new state.
+    weapon is the equipped weapon's value or zero and weakest the value of the
+    weakest monster slain with it, FRESH for none.
+    """
+    value = code & 15
+    kind = code >> 4
+    if kind == HEALTH:
+        health += Scoundrel.heal_value(health, value)
+    elif kind == WEAPON:
+        weapon = value
+        weakest = FRESH
+    else:
+        if weapon and Scoundrel.is_weapon_usable(value, weakest):
+            damage = Scoundrel.damage_value(value, weapon)
+        else:
+            damage = Scoundrel.damage_value(value)
+        if damage > 0:
+            health -= damage
+        if weapon:
+            # Monster placed on the weapon.
+            weakest = min(weakest, value)
+            if weakest <= MIN_MONSTER:
+                # No monster is weaker, the weapon is spent.
+                weapon = 0
+    if not weapon:
+        weakest = 0
+    return (weapon, weakest, health)
+
+def draw(queue, position, room):
+    """
+    Fill room from queue. Return the new position and room, or None when
+    the draw empties the dungeon and ends the game.
+    """
+    count = Scoundrel.FULL_ROOM_SIZE - len(room)
+    room += queue[position:position + count]
+    position += count
+    if position >= len(queue):
+        return None
+    return (position, room)
@@ -0,0 +1,204 @@
+from array import array
+
+from .card import card_ids
+from .card import cards
+from .deck import Deck
+
+class DeckView:
+    """
+    Read-only, live sequence of the cards in one deck of a CompactDeckManager,
+    bottom to top like the lists of DeckManager.
+    """
+
+    __slots__ = ('manager', 'index')
+
+    def __init__(self, manager, index):
+        self.manager = manager
+        self.index = index
+
+    def __len__(self):
+        return self.manager._lengths[self.index]
+
+    def __bool__(self):
+        return self.manager._masks[self.index] != 0
+
+    def __contains__(self, card):
+        card_id = card_ids.get(card)
+        if card_id is None:
+            return False
+        return bool(self.manager._masks[self.index] >> card_id & 1)
+
+    def __iter__(self):
+        manager = self.manager
+        after = manager._after
+        sentinel = manager._sentinel(self.index)
+        node = after[sentinel]
+        while node != sentinel:
+            yield cards[node]
+            node = after[node]
+
+    def __reversed__(self):
+        manager = self.manager
+        before = manager._before
+        sentinel = manager._sentinel(self.index)
+        node = before[sentinel]
+        while node != sentinel:
+            yield cards[node]
+            node = before[node]
+
+    def __getitem__(self, index):
+        if index == -1:
+            return self.manager._top(self.index)
+        return list(self)[index]
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({list(self)!r})'
+
+
+class CompactDeckManager:
+    """
+    DeckManager backend with integer coded cards. Membership of each deck is a
+    bitmask over card ids and order is a doubly linked list held in
+    preallocated arrays, so moving a card is constant time.
+    """
+
+    def __init__(self, *deck_names):
+        decks = [Deck(name) for name in deck_names]
+        # Accept enum members and their string values without coercion.
+        self._deck_index = {}
+        for index, deck in enumerate(decks):
+            self._deck_index[deck] = index
+            self._deck_index[deck.value] = index
+
+        # Nodes are card ids followed by one circular list sentinel per deck.
+        nnodes = len(cards) + len(decks)
+        self._after = array('h', range(nnodes))
+        self._before = array('h', range(nnodes))
+        self._masks = [0] * len(decks)
+        self._lengths = [0] * len(decks)
+        self._views = [DeckView(self, index) for index in range(len(decks))]
+
+    @staticmethod
+    def _sentinel(index):
+        return len(cards) + index
+
+    def _top(self, index):
+        node = self._before[self._sentinel(index)]
+        if node >= len(cards):
+            raise IndexError('deck is empty')
+        return cards[node]
+
+    def _unlink(self, card_id):
+        after = self._after
+        before = self._before
+        next_id = after[card_id]
+        prev_id = before[card_id]
+        after[prev_id] = next_id
+        before[next_id] = prev_id
+
+    def _link(self, card_id, prev_id):
+        """
+        Insert card_id into a list right after node prev_id.
+        """
+        after = self._after
+        before = self._before
+        next_id = after[prev_id]
+        after[prev_id] = card_id
+        before[card_id] = prev_id
+        after[card_id] = next_id
+        before[next_id] = card_id
+
+    def __getitem__(self, deck_name):
+        return self._views[self._deck_index[deck_name]]
+
+    def set_deck(self, name, deck):
+        index = self._deck_index[name]
+        sentinel = self._sentinel(index)
+        for card in list(self._views[index]):
+            self._unlink(card_ids[card])
+        self._masks[index] = 0
+        self._lengths[index] = 0
+        for card in deck:
+            card_id = card_ids[card]
+            self._link(card_id, self._before[sentinel])
+            self._masks[index] |= 1 << card_id
+            self._lengths[index] += 1
+
+    def length(self, deck_name):
+        return self._lengths[self._deck_index[deck_name]]
+
+    def top_card(self, deck_name):
+        return self._top(self._deck_index[deck_name])
+
+    def move_card(self, card, srcname, dstname, to_bottom=False):
+        """
+        Move card from one deck to another. Return the node the card followed
+        in the source deck for unmove_card.
+        """
+        src = self._deck_index[srcname]
+        dst = self._deck_index[dstname]
+        card_id = card.card_id
+        bit = 1 << card_id
+        masks = self._masks
+        if not masks[src] & bit:
+            raise ValueError(f'{card} is not in {srcname}')
+
+        # Unlink and link inline, this is the hot path of a game.
+        after = self._after
+        before = self._before
+        next_id = after[card_id]
+        position = before[card_id]
+        after[position] = next_id
+        before[next_id] = position
+
+        prev_id = len(cards) + dst
+        if not to_bottom:
+            prev_id = before[prev_id]
+        next_id = after[prev_id]
+        after[prev_id] = card_id
+        before[card_id] = prev_id
+        after[card_id] = next_id
+        before[next_id] = card_id
+
+        masks[src] ^= bit
+        masks[dst] |= bit
+        lengths = self._lengths
+        lengths[src] -= 1
+        lengths[dst] += 1
+        return position
+
+    def unmove_card(self, card, srcname, dstname, position, to_bottom=False):
+        """
+        Undo the last move_card of card, given its returned position.
+        """
+        src = self._deck_index[srcname]
+        dst = self._deck_index[dstname]
+        card_id = card_ids[card]
+        bit = 1 << card_id
+        self._unlink(card_id)
+        self._link(card_id, position)
+        self._masks[dst] ^= bit
+        self._masks[src] |= bit
+        self._lengths[dst] -= 1
+        self._lengths[src] += 1
+
+    def snapshot(self):
+        return (
+            self._after[:],
+            self._before[:],
+            tuple(self._masks),
+            tuple(self._lengths),
+        )
+
+    def restore(self, snapshot):
+        after, before, masks, lengths = snapshot
+        self._after[:] = after
+        self._before[:] = before
+        self._masks[:] = masks
+        self._lengths[:] = lengths
+
+    def cards(self, deck_name):
+        return self._views[self._deck_index[deck_name]]
@@ -1 +1,2 @@
 CONFIG_KEY = 'SCOUNDREL_CONFIG'
+CACHE_KEY = 'SCOUNDREL_CACHE'
@@ -7,6 +7,10 @@ class Deck(Enum):
     BATTLEFIELD = 'battlefield'
     DISCARD = 'discard'
 
+    # Members are singletons, hash by identity instead of Enum's python level
+    # hash of the name. Decks are used as keys on every card move.
+    __hash__ = object.__hash__
+
 
 class DeckManager:
 
@@ -27,14 +31,36 @@ class DeckManager:
 
     def move_card(self, card, srcname, dstname, to_bottom=False):
         """
-        Move card from one deck to another.
+        Move card from one deck to another. Return the card's position in the
+        source deck for unmove_card.
         """
         src = self._decks[Deck(srcname)]
         dst = self._decks[Deck(dstname)]
 
-        src.pop(src.index(card))
+        position = src.index(card)
+        src.pop(position)
         index = 0 if to_bottom else len(dst)
         dst.insert(index, card)
+        return position
+
+    def unmove_card(self, card, srcname, dstname, position, to_bottom=False):
+        """
+        Undo the last move_card of card, given its returned position.
+        """
+        src = self._decks[Deck(srcname)]
+        dst = self._decks[Deck(dstname)]
+        dst.pop(0 if to_bottom else -1)
+        src.insert(position, card)
+
+    def snapshot(self):
+        return tuple((key, tuple(deck)) for key, deck in self._decks.items())
+
+    def restore(self, snapshot):
+        """
+        Restore the cards of a snapshot. Deck lists are changed in place.
+        """
+        for key, cards in snapshot:
+            self._decks[key][:] = cards
 
     def cards(self, deck_name):
         return self._decks[Deck(deck_name)]
@@ -1,3 +1,6 @@
+import sys
+import time
+
 from enum import Enum
 
 class Event:
@@ -11,3 +14,251 @@ class Event:
     PLAYER_DAMAGE = 'player_damage'
     QUIT_GAME = 'quit_game'
     RAN_AWAY = 'ran_away'
+
+
+class GameEvent:
+    """
+    Slotted payload of an event emitted by a game.
+    """
+
+    __slots__ = ('game', )
+
+    event_name = None
+
+    # Names of the payload data, in order of the constructor arguments.
+    fields = __slots__
+
+    def __init__(self, game):
+        self.game = game
+
+    def as_kwargs(self):
+        """
+        Payload as the keyword arguments of listeners registered with
+        Scoundrel.on.
+        """
+        return {name: getattr(self, name) for name in self.fields}
+
+
+class BattleMonsterEvent(GameEvent):
+
+    __slots__ = ('monster', )
+
+    event_name = Event.BATTLE_MONSTER
+
+    fields = GameEvent.fields + __slots__
+
+    def __init__(self, game, monster):
+        self.game = game
+        self.monster = monster
+
+
+class BeginTurnEvent(GameEvent):
+
+    __slots__ = ()
+
+    event_name = Event.BEGIN_TURN
+
+
+class GameOverEvent(GameEvent):
+
+    __slots__ = ()
+
+    event_name = Event.GAME_OVER
+
+
+class HealEvent(GameEvent):
+
+    __slots__ = ('amount', 'card')
+
+    event_name = Event.HEAL
+
+    fields = GameEvent.fields + __slots__
+
+    def __init__(self, game, amount, card):
+        self.game = game
+        self.amount = amount
+        self.card = card
+
+
+class InitRoomEvent(GameEvent):
+
+    __slots__ = ()
+
+    event_name = Event.INIT_ROOM
+
+
+class MoveCardEvent(GameEvent):
+
+    __slots__ = ('card', 'source', 'dest')
+
+    event_name = Event.MOVE_CARD
+
+    fields = GameEvent.fields + __slots__
+
+    def __init__(self, game, card, source, dest):
+        self.game = game
+        self.card = card
+        self.source = source
+        self.dest = dest
+
+
+class PlayerDamageEvent(GameEvent):
+
+    __slots__ = ('damage', 'source', 'weapon')
+
+    event_name = Event.PLAYER_DAMAGE
+
+    fields = GameEvent.fields + __slots__
+
+    def __init__(self, game, damage, source, weapon):
+        self.game = game
+        self.damage = damage
+        self.source = source
+        self.weapon = weapon
+
+
+class QuitGameEvent(GameEvent):
+
+    __slots__ = ()
+
+    event_name = Event.QUIT_GAME
+
+
+class RanAwayEvent(GameEvent):
+
+    __slots__ = ()
+
+    event_name = Event.RAN_AWAY
+
+
+class EventBus:
+    """
+    Publish event payloads to subscribed handlers.
+
+    dispatch maps event names to a tuple of their handlers, resolved when
+    subscriptions change. Events without handlers have no key, so publishers
+    can check it and skip building a payload nobody receives.
+    """
+
+    def __init__(self):
+        self.handlers = {}
+        self.dispatch = {}
+        self.timing = None
+
+    def resolve(self, event_name):
+        """
+        Rebuild the dispatch table entry of an event.
+        """
+        handlers = self.handlers.get(event_name)
+        if not handlers:
+            self.handlers.pop(event_name, None)
+            self.dispatch.pop(event_name, None)
+        elif self.timing is None:
+            self.dispatch[event_name] = tuple(handlers)
+        else:
+            timed = self.timing.wrap_handlers(event_name, handlers)
+            self.dispatch[event_name] = timed
+
+    def subscribe(self, event_name, handler):
+        self.handlers.setdefault(event_name, []).append(handler)
+        self.resolve(event_name)
+
+    def unsubscribe(self, event_name, handler):
+        self.handlers[event_name].remove(handler)
+        self.resolve(event_name)
+
+    def set_timing(self, timing):
+        """
+        Time handlers with a ListenerTiming, or stop timing with None.
+        """
+        self.timing = timing
+        for event_name in list(self.handlers):
+            self.resolve(event_name)
+
+    def publish(self, event):
+        for handler in self.dispatch.get(event.event_name, ()):
+            handler(event)
+
+
+def handler_name(handler):
+    """
+    Name of a handler, or of the callback it wraps.
+    """
+    handler = getattr(handler, '__wrapped__', handler)
+    return getattr(handler, '__qualname__', repr(handler))
+
+
+class ListenerTiming:
+    """
+    Call counts and cumulative time of listeners, per event and listener.
+    """
+
+    def __init__(self):
+        # event name to count of emits
+        self.event_counts = {}
+        # (event name, listener name) to [calls, seconds]
+        self.listener_stats = {}
+
+    def wrap_handlers(self, event_name, handlers):
+        """
+        Return a dispatch table entry counting the event and timing each
+        handler.
+        """
+        self.event_counts.setdefault(event_name, 0)
+
+        def count_event(event):
+            self.event_counts[event_name] += 1
+
+        return (count_event, ) + tuple(
+            self.wrap(event_name, handler) for handler in handlers)
+
+    def wrap(self, event_name, handler):
+        key = (event_name, handler_name(handler))
+        stats = self.listener_stats.setdefault(key, [0, 0])
+        perf_counter = time.perf_counter
+
+        def timed_handler(event):
+            start = perf_counter()
+            try:
+                handler(event)
+            finally:
+                stats[0] += 1
+                stats[1] += perf_counter() - start
+
+        return timed_handler
+
+    def event_times(self):
+        """
+        Cumulative seconds of all listeners of each event.
+        """
+        times = dict.fromkeys(self.event_counts, 0)
+        for (event_name, listener), stats in self.listener_stats.items():
+            times[event_name] += stats[1]
+        return times
+
+    def report(self, stream=None):
+        """
+        Write events and then listeners, most time first.
+        """
+        if stream is None:
+            stream = sys.stderr
+        stream.write(f'{"event":24} {"emits":>8} {"total ms":>10}\n')
+        event_times = self.event_times()
+        for event_name in sorted(event_times, key=event_times.get, reverse=True):
+            stream.write(
+                f'{event_name:24} {self.event_counts[event_name]:8}'
+                f' {event_times[event_name] * 1e3:10.3f}\n')
+
+        stream.write(
+            f'\n{"event":24} {"listener":40} {"calls":>8} {"total ms":>10}'
+            f' {"mean us":>10}\n')
+        stats = sorted(
+            self.listener_stats.items(),
+            key = lambda item: item[1][1],
+            reverse = True,
+        )
+        for (event_name, listener), (calls, seconds) in stats:
+            mean = seconds / calls * 1e6 if calls else 0
+            stream.write(
+                f'{event_name:24} {listener:40} {calls:8}'
+                f' {seconds * 1e3:10.3f} {mean:10.1f}\n')
@@ -1,5 +1,6 @@
 import contextlib
 import os
 
-with contextlib.redirect_stdout(open(os.devnull, 'w')):
+# Quiet pygame's import banner.
+with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
     import pygame
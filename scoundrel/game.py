@@ -1,9 +1,20 @@
-from collections import defaultdict
+import functools
 
 from .card import ScoundrelCard
+from .card import cards
 from .deck import Deck
 from .deck import DeckManager
-from .event import Event
+from .event import BattleMonsterEvent
+from .event import BeginTurnEvent
+from .event import EventBus
+from .event import GameOverEvent
+from .event import HealEvent
+from .event import InitRoomEvent
+from .event import MoveCardEvent
+from .event import PlayerDamageEvent
+from .event import QuitGameEvent
+from .event import RanAwayEvent
+from .rng import RandomStream
 
 class Scoundrel:
     """
@@ -14,7 +25,14 @@ class Scoundrel:
 
     FULL_ROOM_SIZE = 4
 
-    def __init__(self, dungeon, prompt_for_turn, deck_manager=None, god_mode=False):
+    def __init__(
+        self,
+        dungeon,
+        prompt_for_turn,
+        deck_manager = None,
+        god_mode = False,
+        rng = None,
+    ):
         if deck_manager is None:
             deck_manager = DeckManager(
                 Deck.DUNGEON,
@@ -29,9 +47,16 @@ class Scoundrel:
         self.god_mode = god_mode
         self.want_quit = False
 
+        # Stream of this game for anything random, like views. Created on
+        # first use when not given, most games never need one.
+        self._rng = rng
+
         self.avoided_room = False
         self.health = self.MAX_HEALTH
-        self.listeners = defaultdict(list)
+        self.events = EventBus()
+
+        # Undo entries of changes to the game, None when not journaling.
+        self.journal = None
 
     @classmethod
     def add_arguments(cls, parser):
@@ -50,36 +75,117 @@ class Scoundrel:
             action = 'store_true',
             help = 'Invincible player mode.',
         )
+        parser.add_argument(
+            '--record',
+            help = 'Append replays of finished games to this replay log.',
+        )
+        parser.add_argument(
+            '--profile',
+            help = 'Profile the run with cProfile and write stats to this path.'
+                ' Only the main process is profiled.',
+        )
 
     @classmethod
-    def from_args(cls, dungeon_deck, interface, args):
+    def from_args(cls, dungeon_deck, interface, args, rng=None):
         instance = cls(
             dungeon = dungeon_deck,
             prompt_for_turn = interface.prompt_for_turn,
             god_mode = args.god,
+            rng = rng,
         )
         return instance
 
     def on(self, event_name, callback):
         """
-        Register a listener callback for an event name.
+        Register a listener callback for an event name. The callback is given
+        the event name, the game and the event's data as keyword arguments.
+        Return the handler subscribed to the event bus.
         """
-        self.listeners[event_name].append(callback)
+        @functools.wraps(callback)
+        def handler(event):
+            callback(event_name=event.event_name, **event.as_kwargs())
 
-    def emit(self, event_name, **event_data):
+        self.events.subscribe(event_name, handler)
+        return handler
+
+    def emit(self, event_class, *args):
         """
-        Emit event to all listeners.
+        Emit event to all listeners. The payload is only built if there are
+        listeners for the event.
         """
-        for listener in self.listeners[event_name]:
-            listener(event_name=event_name, game=self, **event_data)
+        handlers = self.events.dispatch.get(event_class.event_name)
+        if handlers:
+            event = event_class(self, *args)
+            for handler in handlers:
+                handler(event)
 
     def quit(self):
         self.want_quit = True
 
+    def snapshot(self):
+        """
+        Return the state of the game for restore. Listeners are not state.
+        """
+        return (
+            self.decks.snapshot(),
+            self.health,
+            self.avoided_room,
+            self.want_quit,
+        )
+
+    def restore(self, snapshot):
+        """
+        Return to the state of a snapshot, without emitting events. Journal
+        entries are of the state before, when journaling they are cleared and
+        marks taken before are invalid.
+        """
+        decks, self.health, self.avoided_room, self.want_quit = snapshot
+        self.decks.restore(decks)
+        if self.journal is not None:
+            self.journal.clear()
+
+    def start_journal(self):
+        """
+        Journal changes to the game from now on for undo.
+        """
+        self.journal = []
+
+    def stop_journal(self):
+        self.journal = None
+
+    def mark(self):
+        """
+        Return a mark of the journal to undo back to.
+        """
+        return len(self.journal)
+
+    def undo(self, mark=0):
+        """
+        Undo journaled changes back to a mark, without emitting events.
+        """
+        journal = self.journal
+        while len(journal) > mark:
+            entry = journal.pop()
+            kind = entry[0]
+            if kind == 'move':
+                kind, card, source, dest, to_bottom, position = entry
+                self.decks.unmove_card(card, source, dest, position, to_bottom)
+            elif kind == 'health':
+                self.health = entry[1]
+            elif kind == 'avoided':
+                self.avoided_room = entry[1]
+
     def move_card(self, card, source, dest, to_bottom=False):
         # source and dest are keys/names in to the decks
-        self.decks.move_card(card, source, dest, to_bottom)
-        self.emit(Event.MOVE_CARD, card=card, source=source, dest=dest)
+        position = self.decks.move_card(card, source, dest, to_bottom)
+        if self.journal is not None:
+            self.journal.append(('move', card, source, dest, to_bottom, position))
+        # Inline emit, the hot path of a game.
+        handlers = self.events.dispatch.get(MoveCardEvent.event_name)
+        if handlers:
+            event = MoveCardEvent(self, card, source, dest)
+            for handler in handlers:
+                handler(event)
 
     def init_room(self):
         """
@@ -93,13 +199,23 @@ class Scoundrel:
         ):
             card = self.decks.top_card(Deck.DUNGEON)
             self.move_card(card, Deck.DUNGEON, Deck.ROOM)
-        self.emit(Event.INIT_ROOM)
+        self.emit(InitRoomEvent)
 
     def begin_turn(self):
         """
         Start of player's turn just after a new room.
         """
-        self.emit(Event.BEGIN_TURN)
+        self.emit(BeginTurnEvent)
+
+    @property
+    def rng(self):
+        if self._rng is None:
+            self._rng = RandomStream()
+        return self._rng
+
+    @rng.setter
+    def rng(self, rng):
+        self._rng = rng
 
     @property
     def is_new_room(self):
@@ -147,7 +263,9 @@ class Scoundrel:
         """
         Place room cards back in dungeon at the bottom, preserving order.
         """
-        self.emit(Event.RAN_AWAY)
+        self.emit(RanAwayEvent)
+        if self.journal is not None:
+            self.journal.append(('avoided', self.avoided_room))
         self.avoided_room = True
         for card in list(self.decks.cards(Deck.ROOM)):
             self.move_card(card, Deck.ROOM, Deck.DUNGEON, to_bottom=True)
@@ -171,10 +289,11 @@ class Scoundrel:
         """
         Apply health potion card to player.
         """
-        heal_value = health_card.game_value
-        healed = min(heal_value, self.MAX_HEALTH - self.health)
+        healed = self.heal_value(self.health, health_card.game_value)
+        if self.journal is not None:
+            self.journal.append(('health', self.health))
         self.health += healed
-        self.emit(Event.HEAL, amount=healed, card=health_card)
+        self.emit(HealEvent, healed, health_card)
 
     def discard_playing_deck(self):
         """
@@ -215,46 +334,66 @@ class Scoundrel:
                 raise RuntimeError(f'The first card in play must be a weapon.')
             return card
 
+    @classmethod
+    def heal_value(cls, health, potion_value):
+        """
+        Health gained from a potion, capped at maximum health.
+        """
+        return min(potion_value, cls.MAX_HEALTH - health)
+
+    @staticmethod
+    def is_weapon_usable(monster_value, weakest_value):
+        """
+        A weapon reduces damage from a monster if it has not slain a monster,
+        weakest_value is None, or the monster is weaker than the weakest
+        monster already slain with it.
+        """
+        return weakest_value is None or monster_value < weakest_value
+
+    @staticmethod
+    def damage_value(monster_value, weapon_value=0):
+        """
+        Damage from a monster reduced by a weapon's value. Zero or less means
+        no damage.
+        """
+        return monster_value - weapon_value
+
     def get_weapon_for_battle(self, monster_card):
         # If a monster of greater value than the lowest monster already on the
         # weapon is played, the player must fight it barehanded.
         weapon = self.weapon_in_play()
-        if self.decks.cards(Deck.BATTLEFIELD):
+        if weapon:
             monsters_in_play = self.monsters_in_play()
-            if not monsters_in_play:
+            if monsters_in_play:
+                weakest_value = min(card.game_value for card in monsters_in_play)
+            else:
                 # Weapon in play, no monsters, player gets to use it.
+                weakest_value = None
+            if self.is_weapon_usable(monster_card.game_value, weakest_value):
                 return weapon
-            else:
-                weakest_monster = self.weakest_monster()
-                if monster_card.game_value < weakest_monster.game_value:
-                    # The played monster has a lesser value than the weakest
-                    # already in play. The player uses their weapon to reduce
-                    # damage taken.
-                    return weapon
 
     def apply_damage(self, weapon, monster_card):
         """
         Apply damage to player from monster card, reducing it if a weapon is
         used.
         """
-        damage = monster_card.game_value
         if weapon:
             # Reduce damage from weapon.
-            damage -= weapon.game_value
+            weapon_id = weapon.card_id
+        else:
+            weapon_id = BAREHANDED
+        damage = damage_table[monster_card.card_id][weapon_id]
         if damage > 0:
+            if self.journal is not None:
+                self.journal.append(('health', self.health))
             self.health -= damage
-        self.emit(
-            Event.PLAYER_DAMAGE,
-            damage = damage,
-            source = monster_card,
-            weapon = weapon,
-        )
+        self.emit(PlayerDamageEvent, damage, monster_card, weapon)
 
     def battle_monster(self, monster_card):
         """
         Calculate damage from monster and apply to health.
         """
-        self.emit(Event.BATTLE_MONSTER, monster=monster_card)
+        self.emit(BattleMonsterEvent, monster_card)
         weapon = self.get_weapon_for_battle(monster_card)
 
         # Place monster in play or discard if no equiped weapon card.
@@ -296,6 +435,24 @@ class Scoundrel:
         while self.is_playing:
             self.loop_step()
         if self.want_quit:
-            self.emit(Event.QUIT_GAME)
+            self.emit(QuitGameEvent)
         else:
-            self.emit(Event.GAME_OVER)
+            self.emit(GameOverEvent)
+
+
+# Column of damage_table for fighting barehanded.
+BAREHANDED = len(cards)
+
+# Scoundrel.damage_value of every monster against every weapon, indexed by
+# monster and weapon card ids.
+damage_table = [
+    [
+        Scoundrel.damage_value(monster.game_value, weapon.game_value)
+        if monster.is_monster and weapon.is_weapon else None
+        for weapon in cards
+    ] + [
+        Scoundrel.damage_value(monster.game_value)
+        if monster.is_monster else None
+    ]
+    for monster in cards
+]
@@ -1,11 +1,27 @@
+import cProfile
+
 from .argument_parser import argument_parser
 
 def main(argv=None):
     """
     Command line interface.
     """
-    parser = argument_parser()
+    parser = argument_parser(argv)
     args = parser.parse_args(argv)
+    validate = getattr(args, 'validate', None)
+    if validate is not None:
+        delattr(args, 'validate')
+        try:
+            validate(args)
+        except ValueError as error:
+            parser.error(str(error))
     func = args.func
     delattr(args, 'func')
-    func(args)
+    if args.profile:
+        profiler = cProfile.Profile()
+        try:
+            profiler.runcall(func, args)
+        finally:
+            profiler.dump_stats(args.profile)
+    else:
+        func(args)
@@ -0,0 +1,305 @@
+import math
+import random
+import time
+
+from .card import ScoundrelCard
+from .coded_state import FRESH
+from .coded_state import MIN_MONSTER
+from .coded_state import RUN
+from .coded_state import WEAPON
+from .coded_state import card_code
+from .coded_state import draw
+from .coded_state import play_code
+from .deck import Deck
+from .game import Scoundrel
+
+dungeon_size = len(ScoundrelCard.create_dungeon())
+
+# State of a determinized game: (queue, position, room, weapon, weakest,
+# health, can_run) with queue in draw order and coded cards from coded_state.
+
+def legal_moves(state):
+    """
+    Distinct coded cards of the room, and RUN if available.
+    """
+    room = state[2]
+    moves = list(dict.fromkeys(room))
+    if state[6] and len(room) == Scoundrel.FULL_ROOM_SIZE:
+        moves.append(RUN)
+    return moves
+
+def apply_move(state, move):
+    """
+    Return the state after a move, or its reward when the move ends the game.
+    """
+    queue, position, room, weapon, weakest, health, can_run = state
+    if move == RUN:
+        queue = queue[position:] + room
+        position, room = draw(queue, 0, ())
+        return (queue, position, room, weapon, weakest, health, False)
+
+    index = room.index(move)
+    weapon, weakest, health = play_code(move, weapon, weakest, health)
+    room = room[:index] + room[index + 1:]
+    if health <= 0:
+        return reward(health, len(queue) - position + len(room))
+    if len(room) <= 1:
+        drawn = draw(queue, position, room)
+        if drawn is None:
+            return reward(health, 0)
+        position, room = drawn
+    return (queue, position, room, weapon, weakest, health, can_run)
+
+def move_cost(state, move):
+    """
+    Immediate cost of a move like policy.GreedyPolicy. Running costs more
+    than any card so rollouts only run at random.
+    """
+    queue, position, room, weapon, weakest, health, can_run = state
+    if move == RUN:
+        return Scoundrel.MAX_HEALTH
+    if move >> 4 == WEAPON:
+        return weapon - (move & 15)
+    new_weapon, new_weakest, new_health = play_code(move, weapon, weakest, health)
+    return health - new_health
+
+def reward(health, remaining):
+    """
+    Value in [0, 1] of a game ending with health and a number of cards left
+    unplayed. Any win is worth more than any loss, and losses deeper in the
+    dungeon are worth more so lost playouts still guide the search.
+    """
+    if health <= 0:
+        return 0.5 * (1 - remaining / dungeon_size)
+    return 0.5 + 0.5 * health / Scoundrel.MAX_HEALTH
+
+
+class Node:
+    """
+    Statistics of a move in the search tree, shared by every determinization
+    where the move is legal.
+    """
+
+    __slots__ = ('children', 'visits', 'total', 'available')
+
+    def __init__(self):
+        self.children = {}
+        self.visits = 0
+        self.total = 0
+        self.available = 0
+
+    def select(self, moves, exploration):
+        """
+        Child with the best upper confidence bound among the legal moves,
+        counting a child only while it was available.
+        """
+        best = None
+        best_score = None
+        for move in moves:
+            child = self.children[move]
+            child.available += 1
+            score = (
+                child.total / child.visits
+                + exploration * math.sqrt(math.log(child.available) / child.visits)
+            )
+            if best_score is None or score > best_score:
+                best = move
+                best_score = score
+        return best
+
+
+class MCTSPlayer:
+    """
+    Headless player choosing by Monte Carlo tree search. Each playout samples
+    an order for the unseen dungeon cards, keeping a room it ran from at the
+    bottom, so the search never uses the true order of the dungeon.
+    """
+
+    default_playouts = 1000
+    default_exploration = 0.7
+    default_epsilon = 0.2
+
+    def __init__(
+        self,
+        rng = None,
+        playouts = None,
+        time_budget = None,
+        exploration = None,
+        epsilon = None,
+    ):
+        """
+        Search each move for a number of playouts or, with time_budget, for
+        that many seconds of wall clock.
+        """
+        if rng is None:
+            rng = random.Random()
+        self.rng = rng
+
+        if playouts is None:
+            playouts = self.default_playouts
+        self.playouts = playouts
+
+        self.time_budget = time_budget
+
+        if exploration is None:
+            exploration = self.default_exploration
+        self.exploration = exploration
+
+        if epsilon is None:
+            epsilon = self.default_epsilon
+        self.epsilon = epsilon
+
+        # Totals over every search for playouts/second.
+        self.playouts_total = 0
+        self.elapsed_total = 0
+        self.init_game(None)
+
+    @property
+    def playouts_per_second(self):
+        if not self.elapsed_total:
+            return 0
+        return self.playouts_total / self.elapsed_total
+
+    def init_game(self, game):
+        self.root = None
+        self.expected = None
+        # Coded cards in draw order of the room we ran from.
+        self.ran_room = None
+
+    def observe(self, game):
+        """
+        Return what the player can see: (room, weapon, weakest, health,
+        can_run) as in a determinized state.
+        """
+        room = tuple(card_code(card) for card in game.decks.cards(Deck.ROOM))
+        weapon_card = game.weapon_in_play()
+        weapon = weapon_card.game_value if weapon_card else 0
+        monsters = game.monsters_in_play()
+        if monsters:
+            weakest = min(card.game_value for card in monsters)
+        else:
+            weakest = FRESH
+        if weapon and weakest <= MIN_MONSTER:
+            weapon = 0
+        if not weapon:
+            weakest = 0
+        return (room, weapon, weakest, game.health, not game.avoided_room)
+
+    def unseen(self, game):
+        """
+        Return the unknown cards of the dungeon and the known tail at its
+        bottom, both coded.
+        """
+        dungeon = [card_code(card) for card in game.decks.cards(Deck.DUNGEON)]
+        tail = ()
+        if self.ran_room and game.avoided_room:
+            count = min(len(dungeon), len(self.ran_room))
+            tail = self.ran_room[len(self.ran_room) - count:]
+        unknown = dungeon
+        for code in tail:
+            unknown.remove(code)
+        return (unknown, tail)
+
+    def determinize(self, observation, unknown, tail):
+        room, weapon, weakest, health, can_run = observation
+        unknown = list(unknown)
+        self.rng.shuffle(unknown)
+        return (tuple(unknown) + tail, 0, room, weapon, weakest, health, can_run)
+
+    def rollout(self, state):
+        """
+        Play epsilon-greedy to the end and return the reward.
+        """
+        rng = self.rng
+        epsilon = self.epsilon
+        while True:
+            moves = legal_moves(state)
+            if rng.random() < epsilon:
+                move = rng.choice(moves)
+            else:
+                move = min(moves, key=lambda move: move_cost(state, move))
+            state = apply_move(state, move)
+            if not isinstance(state, tuple):
+                return state
+
+    def playout(self, root, state):
+        """
+        One iteration of select, expand, rollout and backpropagate.
+        """
+        node = root
+        path = [node]
+        while isinstance(state, tuple):
+            moves = legal_moves(state)
+            untried = [move for move in moves if move not in node.children]
+            if untried:
+                move = self.rng.choice(untried)
+                child = node.children[move] = Node()
+                child.available += 1
+                path.append(child)
+                state = apply_move(state, move)
+                if isinstance(state, tuple):
+                    state = self.rollout(state)
+                break
+            move = node.select(moves, self.exploration)
+            node = node.children[move]
+            path.append(node)
+            state = apply_move(state, move)
+
+        # The game is over and state is its reward.
+        for node in path:
+            node.visits += 1
+            node.total += state
+
+    def search(self, game):
+        """
+        Search from the current turn and return the root node with the
+        observation searched from.
+        """
+        observation = self.observe(game)
+        if self.root is not None and observation == self.expected:
+            # Same room as the last search expected, keep its statistics.
+            root = self.root
+        else:
+            root = Node()
+        unknown, tail = self.unseen(game)
+
+        start = time.perf_counter()
+        if self.time_budget is None:
+            for _ in range(self.playouts):
+                self.playout(root, self.determinize(observation, unknown, tail))
+            count = self.playouts
+        else:
+            deadline = start + self.time_budget
+            count = 0
+            while not count or time.perf_counter() < deadline:
+                self.playout(root, self.determinize(observation, unknown, tail))
+                count += 1
+        self.playouts_total += count
+        self.elapsed_total += time.perf_counter() - start
+        return (root, observation)
+
+    def prompt_for_turn(self, game, available_choices):
+        root, observation = self.search(game)
+        room, weapon, weakest, health, can_run = observation
+        # Every determinization shares the room, the children are its moves.
+        move = max(root.children, key=lambda move: root.children[move].visits)
+
+        # Keep the subtree if the move leaves us in this room.
+        self.root = None
+        self.expected = None
+        if move == RUN:
+            self.ran_room = room
+        else:
+            index = room.index(move)
+            rest = room[:index] + room[index + 1:]
+            state = apply_move(((), 0, room, weapon, weakest, health, can_run), move)
+            if len(rest) > 1 and isinstance(state, tuple):
+                self.root = root.children[move]
+                self.expected = (rest,) + state[3:]
+
+        for value, label in available_choices:
+            if move == RUN:
+                if not isinstance(value, ScoundrelCard):
+                    return value
+            elif isinstance(value, ScoundrelCard) and card_code(value) == move:
+                return value
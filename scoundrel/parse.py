@@ -1,2 +1,16 @@
+import argparse
+
 def size(s):
     return tuple(map(int, s.replace(',', ' ').split()))
+
+def positive_int(s):
+    value = int(s)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f'{s} is not positive')
+    return value
+
+def positive_float(s):
+    value = float(s)
+    if value <= 0:
+        raise argparse.ArgumentTypeError(f'{s} is not positive')
+    return value
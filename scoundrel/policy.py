@@ -0,0 +1,63 @@
+import random
+
+from .card import ScoundrelCard
+from .mcts import MCTSPlayer
+
+class RandomPolicy:
+    """
+    Headless player that picks uniformly from the available choices.
+    """
+
+    def __init__(self, rng=None):
+        if rng is None:
+            rng = random.Random()
+        self.rng = rng
+
+    def prompt_for_turn(self, game, available_choices):
+        value, label = self.rng.choice(available_choices)
+        return value
+
+
+class GreedyPolicy:
+    """
+    Headless player that plays the card costing the least health right now.
+    Never runs from a room.
+    """
+
+    def __init__(self, rng=None):
+        # Deterministic, rng accepted for a uniform policy signature.
+        self.rng = rng
+
+    @staticmethod
+    def card_cost(game, card):
+        """
+        Immediate cost of playing card. Negative costs are gains.
+        """
+        if card.is_monster:
+            weapon = game.get_weapon_for_battle(card)
+            if weapon:
+                damage = game.damage_value(card.game_value, weapon.game_value)
+            else:
+                damage = game.damage_value(card.game_value)
+            return max(damage, 0)
+        elif card.is_weapon:
+            weapon = game.weapon_in_play()
+            current = weapon.game_value if weapon else 0
+            return current - card.game_value
+        elif card.is_health:
+            return -game.heal_value(game.health, card.game_value)
+
+    def prompt_for_turn(self, game, available_choices):
+        cards = [
+            value for value, label in available_choices
+            if isinstance(value, ScoundrelCard)
+        ]
+        # min keeps the first of equal costs, room order breaks ties.
+        return min(cards, key=lambda card: self.card_cost(game, card))
+
+
+policy_classes = {
+    'greedy': GreedyPolicy,
+    'mcts': MCTSPlayer,
+    'random': RandomPolicy,
+}
@@ -0,0 +1,327 @@
+import math
+import struct
+import sys
+import time
+
+from collections import namedtuple
+from functools import lru_cache
+
+from .card import ScoundrelCard
+from .card import card_ids
+from .card import cards
+from .compact_deck import CompactDeckManager
+from .deck import Deck
+from .game import Scoundrel
+
+MAGIC = b'SCRP\x02'
+
+HALF_MONSTERS = 1
+GOD_MODE = 2
+WON = 4
+
+# Bytes of the seed, before it. Seeds are any int, signed little-endian.
+seed_size_struct = struct.Struct('<H')
+
+# game index, flags, final health, turns
+record_struct = struct.Struct('<IBhB')
+
+Replay = namedtuple(
+    'Replay',
+    'seed index half_monsters god_mode dungeon choices won health',
+)
+
+@lru_cache
+def dungeon_ids(half_monsters):
+    """
+    Sorted card ids of a new dungeon, as a tuple.
+    """
+    return tuple(sorted(
+        card_ids[card]
+        for card in ScoundrelCard.create_dungeon(half_monsters=half_monsters)
+    ))
+
+@lru_cache
+def permutation_size(ncards):
+    """
+    Bytes to hold the rank of a permutation of ncards.
+    """
+    return (math.factorial(ncards).bit_length() + 7) // 8
+
+def rank_dungeon(dungeon, half_monsters):
+    """
+    Return the dungeon's order as its rank among every order of its cards.
+    """
+    remaining = list(dungeon_ids(half_monsters))
+    rank = 0
+    for card in dungeon:
+        index = remaining.index(card_ids[card])
+        rank = rank * len(remaining) + index
+        del remaining[index]
+    return rank
+
+def unrank_dungeon(rank, ids):
+    """
+    Return the dungeon, a list of cards, for a rank from rank_dungeon of
+    the dungeon with sorted card ids ids.
+    """
+    remaining = list(ids)
+    indexes = []
+    for radix in range(1, len(remaining) + 1):
+        rank, index = divmod(rank, radix)
+        indexes.append(index)
+    return [cards[remaining.pop(index)] for index in reversed(indexes)]
+
+def pack_choices(choices):
+    """
+    Pack choice indexes two to a byte, low nibble first.
+    """
+    packed = bytearray((len(choices) + 1) // 2)
+    for position, index in enumerate(choices):
+        packed[position // 2] |= index << (position % 2 * 4)
+    return bytes(packed)
+
+def unpack_choices(packed, count):
+    return [
+        packed[position // 2] >> (position % 2 * 4) & 15
+        for position in range(count)
+    ]
+
+def encode_replay(replay):
+    """
+    Return the bytes of a replay.
+    """
+    flags = (
+        HALF_MONSTERS * replay.half_monsters
+        | GOD_MODE * replay.god_mode
+        | WON * replay.won
+    )
+    rank = rank_dungeon(replay.dungeon, replay.half_monsters)
+    seed = replay.seed.to_bytes(
+        replay.seed.bit_length() // 8 + 1,
+        'little',
+        signed = True,
+    )
+    return (
+        seed_size_struct.pack(len(seed))
+        + seed
+        + record_struct.pack(
+            replay.index,
+            flags,
+            replay.health,
+            len(replay.choices),
+        )
+        + rank.to_bytes(permutation_size(len(replay.dungeon)), 'little')
+        + pack_choices(replay.choices)
+    )
+
+def decode_replay(data, offset=0):
+    """
+    Decode the replay at offset in data. Return the replay and the offset
+    after it.
+    """
+    seed_size, = seed_size_struct.unpack_from(data, offset)
+    offset += seed_size_struct.size
+    seed = int.from_bytes(data[offset:offset + seed_size], 'little', signed=True)
+    offset += seed_size
+    index, flags, health, turns = record_struct.unpack_from(data, offset)
+    offset += record_struct.size
+    half_monsters = bool(flags & HALF_MONSTERS)
+    ids = dungeon_ids(half_monsters)
+    size = permutation_size(len(ids))
+    rank = int.from_bytes(data[offset:offset + size], 'little')
+    offset += size
+    nbytes = (turns + 1) // 2
+    choices = unpack_choices(data[offset:offset + nbytes], turns)
+    offset += nbytes
+    replay = Replay(
+        seed = seed,
+        index = index,
+        half_monsters = half_monsters,
+        god_mode = bool(flags & GOD_MODE),
+        dungeon = unrank_dungeon(rank, ids),
+        choices = choices,
+        won = bool(flags & WON),
+        health = health,
+    )
+    return (replay, offset)
+
+def write_replays(path, encoded):
+    """
+    Append encoded replays to a replay log, creating it if needed.
+    """
+    with open(path, 'a+b') as replay_file:
+        if replay_file.tell() == 0:
+            replay_file.write(MAGIC)
+        else:
+            # Appends land at the end whatever the position.
+            replay_file.seek(0)
+            if replay_file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f'{path} is not a replay log of this version.')
+        for data in encoded:
+            replay_file.write(data)
+
+def read_replays(path):
+    """
+    Generate the replays of a replay log.
+    """
+    with open(path, 'rb') as replay_file:
+        data = replay_file.read()
+    if not data.startswith(MAGIC):
+        raise ValueError(f'{path} is not a replay log.')
+    offset = len(MAGIC)
+    while offset < len(data):
+        replay, offset = decode_replay(data, offset)
+        yield replay
+
+def choice_index(choice, available_choices):
+    """
+    Index of the choice returned by prompt_for_turn, running is any value
+    that is not a card. None if it is not available.
+    """
+    is_card = isinstance(choice, ScoundrelCard)
+    for index, (value, label) in enumerate(available_choices):
+        if is_card:
+            if value == choice:
+                return index
+        elif not isinstance(value, ScoundrelCard):
+            return index
+
+
+class ReplayRecorder:
+    """
+    Record the choices of a player, anything with prompt_for_turn, for a
+    replay of its game.
+    """
+
+    def __init__(self, player):
+        self.player = player
+        self.choices = []
+
+    def prompt_for_turn(self, game, available_choices):
+        choice = self.player.prompt_for_turn(game, available_choices)
+        index = choice_index(choice, available_choices)
+        if index is not None:
+            self.choices.append(index)
+        return choice
+
+    def replay(self, game, dungeon, seed=0, index=0, half_monsters=False):
+        """
+        Replay of the finished game played from dungeon.
+        """
+        return Replay(
+            seed = seed,
+            index = index,
+            half_monsters = half_monsters,
+            god_mode = game.god_mode,
+            dungeon = list(dungeon),
+            choices = list(self.choices),
+            won = game.is_player_alive,
+            health = game.health,
+        )
+
+
+def play_replay(replay, deck_manager=None):
+    """
+    Play the recorded choices without a view. Return tuple (won, health,
+    turns) or None if the choices do not fit the game.
+    """
+    choices = iter(replay.choices)
+    turns = 0
+
+    def prompt_for_turn(game, available_choices):
+        nonlocal turns
+        index = next(choices, None)
+        if index is None or index >= len(available_choices):
+            game.quit()
+            return
+        turns += 1
+        value, label = available_choices[index]
+        return value
+
+    game = Scoundrel(
+        list(replay.dungeon),
+        prompt_for_turn,
+        deck_manager = deck_manager,
+        god_mode = replay.god_mode,
+    )
+    game.play_loop()
+    if game.want_quit or turns != len(replay.choices):
+        return
+    return (game.is_player_alive, game.health, turns)
+
+def verify_replay(replay, deck_manager=None):
+    """
+    True if replaying gives the recorded outcome.
+    """
+    outcome = play_replay(replay, deck_manager)
+    return outcome == (replay.won, replay.health, len(replay.choices))
+
+
+class ReplayVerifier:
+    """
+    Replay logs and check every game's recorded outcome.
+    """
+
+    @classmethod
+    def add_subparser(cls, subparsers):
+        """
+        Add subparser to verify replay logs.
+        """
+        subparser = subparsers.add_parser('replay')
+        subparser.add_argument(
+            'paths',
+            nargs = '+',
+            help = 'Replay log files.',
+        )
+        subparser.add_argument(
+            '--compact-decks',
+            action = 'store_true',
+            help = 'Use the integer coded deck manager.',
+        )
+        subparser.set_defaults(func=run)
+
+    def __init__(self, compact_decks=False):
+        self.compact_decks = compact_decks
+        self.games = 0
+        self.failures = []
+
+    def verify(self, path):
+        """
+        Verify every replay in a log, keeping (path, number, replay) of
+        failures.
+        """
+        for number, replay in enumerate(read_replays(path)):
+            if self.compact_decks:
+                deck_manager = CompactDeckManager(*Deck)
+            else:
+                deck_manager = None
+            self.games += 1
+            if not verify_replay(replay, deck_manager):
+                self.failures.append((path, number, replay))
+
+    def report(self, elapsed, stream=None):
+        if stream is None:
+            stream = sys.stdout
+        for path, number, replay in self.failures:
+            stream.write(
+                f'{path}:{number}: seed {replay.seed} index {replay.index}'
+                f' does not replay to won={replay.won} health={replay.health}\n')
+        stream.write(f'games: {self.games}\n')
+        stream.write(f'failures: {len(self.failures)}\n')
+        stream.write(f'elapsed: {elapsed:.3f}s\n')
+        if elapsed:
+            stream.write(f'games/second: {self.games / elapsed:.0f}\n')
+
+
+def run(args):
+    """
+    Verify replay logs from command line arguments and report the result.
+    """
+    verifier = ReplayVerifier(compact_decks=args.compact_decks)
+    start = time.perf_counter()
+    for path in args.paths:
+        verifier.verify(path)
+    elapsed = time.perf_counter() - start
+    verifier.report(elapsed)
+    if verifier.failures:
+        sys.exit(1)
@@ -0,0 +1,65 @@
+import hashlib
+import random
+
+from functools import lru_cache
+
+from .card import ScoundrelCard
+
+class RandomStream(random.Random):
+    """
+    Random number generator for one stream of a tree of streams derived from
+    a master seed. A stream is seeded by hashing the master seed with its key
+    path, so its numbers depend only on those and not on how many numbers
+    other streams drew, or in which process.
+    """
+
+    def __init__(self, master_seed=None, key=()):
+        if master_seed is None:
+            master_seed = random.SystemRandom().getrandbits(32)
+        self.master_seed = master_seed
+        self.key = tuple(key)
+        super().__init__(self.derive_seed(master_seed, self.key))
+
+    @staticmethod
+    def derive_seed(master_seed, key):
+        digest = hashlib.blake2b(
+            repr((master_seed, ) + key).encode(),
+            digest_size = 32,
+        ).digest()
+        return int.from_bytes(digest, 'little')
+
+    def spawn(self, *key):
+        """
+        Return the independent child stream for key. The same key always gives
+        the same stream.
+        """
+        return self.__class__(self.master_seed, self.key + key)
+
+    def __reduce__(self):
+        return (self.__class__, (self.master_seed, self.key), self.getstate())
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.master_seed!r}, {self.key!r})'
+
+
+def game_stream(master_seed, index=0):
+    """
+    Stream of game index for a master seed. An interactive game is index 0.
+    """
+    # The stream spawn would give, without seeding the master stream.
+    return RandomStream(master_seed, (index, ))
+
+@lru_cache
+def dungeon_template(half_monsters):
+    """
+    Unshuffled dungeon, shared. Cards are not changed by games.
+    """
+    return tuple(ScoundrelCard.create_dungeon(half_monsters=half_monsters))
+
+def shuffled_dungeon(rng, half_monsters=False):
+    """
+    New dungeon shuffled from the dungeon stream of a game stream.
+    """
+    dungeon = list(dungeon_template(half_monsters))
+    rng.spawn('dungeon').shuffle(dungeon)
+    return dungeon
@@ -1,22 +1,55 @@
-import random
-
-from .card import ScoundrelCard
+from .event import ListenerTiming
 from .game import Scoundrel
+from .replay import ReplayRecorder
+from .replay import encode_replay
+from .replay import write_replays
+from .rng import game_stream
+from .rng import shuffled_dungeon
+
+def add_arguments(parser):
+    """
+    Add arguments of the interactive subcommands run plays.
+    """
+    parser.add_argument(
+        '--time-listeners',
+        action = 'store_true',
+        help = 'Report call counts and time of event listeners to stderr.',
+    )
 
 def run(args):
     """
     """
-    if args.seed is not None:
-        random.seed(args.seed)
+    rng = game_stream(args.seed)
 
     # Build a scoundrel dungeon deck
-    dungeon_deck = ScoundrelCard.create_dungeon(half_monsters=args.half_monsters)
-    random.shuffle(dungeon_deck)
+    dungeon_deck = shuffled_dungeon(rng, half_monsters=args.half_monsters)
 
     # XXX: Messy bit of hard coding.
 
     interface = args.view_class(args)
 
-    game = Scoundrel.from_args(dungeon_deck, interface, args)
+    if args.record:
+        player = ReplayRecorder(interface)
+        dungeon = list(dungeon_deck)
+    else:
+        player = interface
+
+    game = Scoundrel.from_args(dungeon_deck, player, args, rng=rng)
+    if args.time_listeners:
+        timing = ListenerTiming()
+        game.events.set_timing(timing)
     interface.init_game(game)
-    game.play_loop()
+    try:
+        game.play_loop()
+    finally:
+        if args.time_listeners:
+            timing.report()
+
+    if args.record and not game.want_quit:
+        replay = player.replay(
+            game,
+            dungeon,
+            seed = rng.master_seed,
+            half_monsters = args.half_monsters,
+        )
+        write_replays(args.record, [encode_replay(replay)])
@@ -0,0 +1,390 @@
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+from collections import namedtuple
+
+from . import parse
+from .compact_deck import CompactDeckManager
+from .deck import Deck
+from .game import Scoundrel
+from .policy import policy_classes
+from .replay import ReplayRecorder
+from .replay import encode_replay
+from .replay import write_replays
+from .rng import game_stream
+from .rng import shuffled_dungeon
+
+Chunk = namedtuple(
+    'Chunk',
+    'engine policy policy_options seed half_monsters god_mode compact_decks'
+    ' record start stop',
+)
+
+class SimulationResult:
+    """
+    Aggregated outcome of many headless games.
+    """
+
+    def __init__(self):
+        self.games = 0
+        self.wins = 0
+        self.health_total = 0
+        self.turns_total = 0
+        self.min_health = None
+        self.max_health = None
+        # Encoded replays of the games when recording.
+        self.replays = []
+
+    def add(self, won, health, turns):
+        """
+        Add the outcome of one game.
+        """
+        self.games += 1
+        self.wins += won
+        self.health_total += health
+        self.turns_total += turns
+        if self.min_health is None or health < self.min_health:
+            self.min_health = health
+        if self.max_health is None or health > self.max_health:
+            self.max_health = health
+
+    def merge(self, other):
+        """
+        Add the totals of another result into this one.
+        """
+        self.games += other.games
+        self.wins += other.wins
+        self.health_total += other.health_total
+        self.turns_total += other.turns_total
+        self.merge_extremes(other.min_health, other.max_health)
+        self.replays.extend(other.replays)
+
+    def merge_extremes(self, min_health, max_health):
+        for health in (min_health, max_health):
+            if health is None:
+                continue
+            if self.min_health is None or health < self.min_health:
+                self.min_health = health
+            if self.max_health is None or health > self.max_health:
+                self.max_health = health
+
+    def add_batch(self, won, health, turns):
+        """
+        Add outcomes from arrays of a batch of games.
+        """
+        self.games += len(won)
+        self.wins += int(won.sum())
+        self.health_total += int(health.sum())
+        self.turns_total += int(turns.sum())
+        self.merge_extremes(int(health.min()), int(health.max()))
+
+    @property
+    def win_rate(self):
+        return self.wins / self.games if self.games else 0
+
+    @property
+    def mean_health(self):
+        return self.health_total / self.games if self.games else 0
+
+    @property
+    def mean_turns(self):
+        return self.turns_total / self.games if self.games else 0
+
+
+def play_game(dungeon, policy, god_mode=False, deck_manager=None, rng=None):
+    """
+    Play one game of scoundrel without a view. Return tuple (won, health,
+    turns, game).
+    """
+    turns = 0
+
+    def prompt_for_turn(game, available_choices):
+        nonlocal turns
+        turns += 1
+        return policy.prompt_for_turn(game, available_choices)
+
+    game = Scoundrel(
+        dungeon,
+        prompt_for_turn,
+        deck_manager = deck_manager,
+        god_mode = god_mode,
+        rng = rng,
+    )
+    game.play_loop()
+    return (game.is_player_alive, game.health, turns, game)
+
+def play_chunk(chunk):
+    """
+    Play the games of a chunk of work and return their aggregated result.
+    """
+    if chunk.engine == 'batch':
+        # NumPy is only needed by the batch engine.
+        from .batch import play_batch_chunk
+        return play_batch_chunk(chunk)
+
+    policy_class = policy_classes[chunk.policy]
+    result = SimulationResult()
+    for index in range(chunk.start, chunk.stop):
+        # Each game has its own stream so results do not depend on how the
+        # games are divided into chunks and processes. Game 0 is the game
+        # runner.run plays for the seed.
+        rng = game_stream(chunk.seed, index)
+        dungeon = shuffled_dungeon(rng, half_monsters=chunk.half_monsters)
+        policy = policy_class(rng.spawn('policy'), **chunk.policy_options)
+        if chunk.record:
+            policy = ReplayRecorder(policy)
+            played = list(dungeon)
+        if chunk.compact_decks:
+            deck_manager = CompactDeckManager(*Deck)
+        else:
+            deck_manager = None
+        won, health, turns, game = play_game(
+            dungeon, policy, chunk.god_mode, deck_manager, rng)
+        result.add(won, health, turns)
+        if chunk.record:
+            replay = policy.replay(
+                game,
+                played,
+                seed = chunk.seed,
+                index = index,
+                half_monsters = chunk.half_monsters,
+            )
+            result.replays.append(encode_replay(replay))
+    return result
+
+
+class Simulation:
+    """
+    Play many headless games of scoundrel across a pool of processes.
+    """
+
+    default_games = 1000
+    default_engine = 'scoundrel'
+    default_chunk_sizes = {
+        'batch': 100000,
+        'scoundrel': 500,
+    }
+    default_policy = 'greedy'
+
+    def __init__(
+        self,
+        engine = None,
+        policy = None,
+        games = None,
+        seed = None,
+        half_monsters = False,
+        god_mode = False,
+        compact_decks = False,
+        record = None,
+        processes = None,
+        chunk_size = None,
+        policy_options = None,
+    ):
+        if engine is None:
+            engine = self.default_engine
+        self.engine = engine
+
+        if policy is None:
+            policy = self.default_policy
+        self.policy = policy
+
+        # Keyword arguments of the policy, like the budget of mcts.
+        if policy_options is None:
+            policy_options = {}
+        self.policy_options = policy_options
+
+        if games is None:
+            games = self.default_games
+        self.games = games
+
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self.seed = seed
+
+        self.half_monsters = half_monsters
+        self.god_mode = god_mode
+        self.compact_decks = compact_decks
+        self.record = record
+
+        if processes is None:
+            processes = os.cpu_count() or 1
+        self.processes = processes
+
+        if chunk_size is None:
+            chunk_size = self.default_chunk_sizes[engine]
+        self.chunk_size = chunk_size
+
+    @classmethod
+    def add_subparser(cls, subparsers):
+        """
+        Add subparser for headless simulation of many games.
+        """
+        subparser = subparsers.add_parser('simulate')
+        subparser.add_argument(
+            '--games',
+            type = parse.positive_int,
+            default = cls.default_games,
+            help = 'Number of games to play. Default: %(default)s',
+        )
+        subparser.add_argument(
+            '--engine',
+            choices = sorted(cls.default_chunk_sizes),
+            default = cls.default_engine,
+            help =
+                'Scoundrel plays games one by one, batch advances a chunk of'
+                ' games in lockstep with NumPy. Batch draws dungeons per chunk'
+                ' for speed, so its results for a seed differ from the'
+                ' scoundrel engine and change with --chunk-size.'
+                ' Default: %(default)s',
+        )
+        subparser.add_argument(
+            '--policy',
+            choices = sorted(policy_classes),
+            default = cls.default_policy,
+            help = 'Player policy. Default: %(default)s',
+        )
+        subparser.add_argument(
+            '--playouts',
+            type = parse.positive_int,
+            help = 'Playouts per move of the mcts policy. Default:'
+                f' {policy_classes["mcts"].default_playouts}',
+        )
+        subparser.add_argument(
+            '--time-budget',
+            type = parse.positive_float,
+            help = 'Seconds per move of the mcts policy, instead of playouts.',
+        )
+        subparser.add_argument(
+            '--compact-decks',
+            action = 'store_true',
+            help = 'Use the integer coded deck manager.',
+        )
+        subparser.add_argument(
+            '--processes',
+            type = parse.positive_int,
+            help = 'Number of worker processes. Default: cpu count',
+        )
+        subparser.add_argument(
+            '--chunk-size',
+            type = parse.positive_int,
+            help = 'Games per unit of work sent to a worker. Default: 500 for'
+                ' scoundrel, 100000 for batch.',
+        )
+        subparser.set_defaults(
+            func = run,
+            validate = cls.validate_args,
+        )
+
+    @staticmethod
+    def validate_args(args):
+        """
+        Raise ValueError for options that do not work together.
+        """
+        if args.policy != 'mcts':
+            if args.playouts is not None or args.time_budget is not None:
+                raise ValueError(
+                    '--playouts and --time-budget are for the mcts policy.')
+        if args.engine == 'batch':
+            if args.record:
+                raise ValueError('Batch engine does not record replays.')
+            from .batch import batch_policies
+            if args.policy not in batch_policies:
+                raise ValueError(f'Batch engine has no {args.policy} policy.')
+
+    @classmethod
+    def from_args(cls, args):
+        cls.validate_args(args)
+        instance = cls(
+            engine = args.engine,
+            policy = args.policy,
+            games = args.games,
+            seed = args.seed,
+            half_monsters = args.half_monsters,
+            god_mode = args.god,
+            compact_decks = args.compact_decks,
+            record = args.record,
+            processes = args.processes,
+            chunk_size = args.chunk_size,
+            policy_options = cls.policy_options_from_args(args),
+        )
+        return instance
+
+    @staticmethod
+    def policy_options_from_args(args):
+        options = {}
+        if args.playouts is not None:
+            options['playouts'] = args.playouts
+        if args.time_budget is not None:
+            options['time_budget'] = args.time_budget
+        return options
+
+    def chunks(self):
+        """
+        Generate units of work covering all the games.
+        """
+        for start in range(0, self.games, self.chunk_size):
+            stop = min(start + self.chunk_size, self.games)
+            yield Chunk(
+                engine = self.engine,
+                policy = self.policy,
+                policy_options = self.policy_options,
+                seed = self.seed,
+                half_monsters = self.half_monsters,
+                god_mode = self.god_mode,
+                compact_decks = self.compact_decks,
+                record = bool(self.record),
+                start = start,
+                stop = stop,
+            )
+
+    def run(self):
+        """
+        Play all the games and return the aggregated result.
+        """
+        result = SimulationResult()
+        if self.processes == 1:
+            results = map(play_chunk, self.chunks())
+            for chunk_result in results:
+                result.merge(chunk_result)
+        else:
+            with multiprocessing.Pool(self.processes) as pool:
+                results = pool.imap_unordered(play_chunk, self.chunks())
+                for chunk_result in results:
+                    result.merge(chunk_result)
+        if self.record:
+            write_replays(self.record, result.replays)
+            result.replays = []
+        return result
+
+    def report(self, result, elapsed, stream=None):
+        if stream is None:
+            stream = sys.stdout
+        stream.write(f'engine: {self.engine}\n')
+        stream.write(f'policy: {self.policy}\n')
+        stream.write(f'seed: {self.seed}\n')
+        stream.write(f'games: {result.games}\n')
+        if self.god_mode:
+            # The player cannot die.
+            stream.write('wins: N/A (god mode)\n')
+        else:
+            stream.write(f'wins: {result.wins} ({result.win_rate:.2%})\n')
+        stream.write(
+            f'final health: mean {result.mean_health:.2f},'
+            f' min {result.min_health}, max {result.max_health}\n')
+        stream.write(f'turns: mean {result.mean_turns:.2f}\n')
+        stream.write(f'elapsed: {elapsed:.3f}s\n')
+        stream.write(f'games/second: {result.games / elapsed:.0f}\n')
+
+
+def run(args):
+    """
+    Run a simulation from command line arguments and report the result.
+    """
+    simulation = Simulation.from_args(args)
+    start = time.perf_counter()
+    result = simulation.run()
+    elapsed = time.perf_counter() - start
+    simulation.report(result, elapsed)
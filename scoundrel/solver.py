@@ -0,0 +1,225 @@
+import sys
+
+from collections import namedtuple
+
+from . import parse
+from .coded_state import RUN
+from .coded_state import card_code
+from .coded_state import draw
+from .coded_state import play_code
+from .game import Scoundrel
+from .rng import game_stream
+from .rng import shuffled_dungeon
+
+Solution = namedtuple('Solution', 'winnable health line nodes')
+
+def dominates(state1, state2):
+    """
+    True if (health, weapon, weakest) state1 is at least as good as state2
+    for every line of play.
+    """
+    health1, weapon1, weakest1 = state1[:3]
+    health2, weapon2, weakest2 = state2[:3]
+    return (
+        health1 >= health2
+        and (
+            not weapon2
+            or (weapon1 >= weapon2 and weakest1 >= weakest2)
+        )
+    )
+
+def add_to_frontier(frontier, entry):
+    """
+    Add entry to a list of mutually non-dominated entries.
+    """
+    for other in frontier:
+        if dominates(other, entry):
+            return
+    frontier[:] = [other for other in frontier if not dominates(entry, other)]
+    frontier.append(entry)
+
+
+class Solver:
+    """
+    Exact search of every choice in a dungeon whose order is known.
+
+    Final health never decreases with more health, a stronger weapon or a
+    weaker monster on it, so for each position in the dungeon and room only
+    the states not dominated in those three are kept. States are searched
+    forward in order of cards played, sharing a table keyed by dungeon
+    position and room.
+    """
+
+    default_seed = 0
+
+    @classmethod
+    def add_subparser(cls, subparsers):
+        """
+        Add subparser to label seeds as winnable with their best final health.
+        """
+        subparser = subparsers.add_parser('solve')
+        subparser.add_argument(
+            '--count',
+            type = parse.positive_int,
+            default = 1,
+            help = 'Number of consecutive seeds from --seed, or from'
+                f' {cls.default_seed} without --seed. Default: %(default)s',
+        )
+        subparser.set_defaults(func=run)
+
+    def __init__(self, dungeon):
+        # Draw order, next card first. Scoundrel draws from the end of a deck.
+        self.queue = tuple(card_code(card) for card in reversed(dungeon))
+        self.nodes = 0
+
+    @staticmethod
+    def room_key(room, can_run):
+        """
+        Order of the room only matters when it may be run from.
+        """
+        if can_run and len(room) == Scoundrel.FULL_ROOM_SIZE:
+            return room
+        return tuple(sorted(room))
+
+    def solve(self):
+        """
+        Search the whole dungeon and return a Solution with the best final
+        health and a line of choice indexes reaching it. Final health is zero
+        when every line dies.
+        """
+        queues = [self.queue]
+        # Best terminal (health, weapon, weakest, parent, move), and one death
+        # for a line when nothing wins.
+        best = None
+        death = None
+
+        start = draw(self.queue, 0, ())
+        if start is None:
+            return Solution(True, Scoundrel.MAX_HEALTH, [], 0)
+        position, room = start
+
+        # levels[n] maps (queue index, position, room) to the frontier of
+        # entries (health, weapon, weakest, parent, move) after n cards
+        # played.
+        levels = [{(0, position, room): [(Scoundrel.MAX_HEALTH, 0, 0, None, None)]}]
+        level_index = 0
+        while level_index < len(levels):
+            level = levels[level_index]
+            following = {}
+            # Running keeps the count of cards played, runs land in this
+            # level and are taken after the states that can still run.
+            ran = {}
+            for current in (level, ran):
+                for (qid, position, room), frontier in current.items():
+                    queue = queues[qid]
+                    can_run = qid == 0
+                    if can_run and len(room) == Scoundrel.FULL_ROOM_SIZE:
+                        run_queue = queue[position:] + room
+                        queues.append(run_queue)
+                        run_qid = len(queues) - 1
+                        position_room = draw(run_queue, 0, ())
+                        run_position, run_room = position_room
+                        run_key = (run_qid, run_position, self.room_key(run_room, False))
+                        run_frontier = ran.setdefault(run_key, [])
+                        for entry in frontier:
+                            self.nodes += 1
+                            add_to_frontier(run_frontier, entry[:3] + (entry, RUN))
+
+                    for index, code in enumerate(room):
+                        if code in room[:index]:
+                            continue
+                        rest = room[:index] + room[index + 1:]
+                        if len(rest) > 1:
+                            drawn = (position, rest)
+                        else:
+                            drawn = draw(queue, position, rest)
+                        next_frontier = None
+
+                        for entry in frontier:
+                            self.nodes += 1
+                            health, weapon, weakest = entry[:3]
+                            weapon, weakest, health = play_code(code, weapon, weakest, health)
+                            new_entry = (health, weapon, weakest, entry, code)
+                            if health <= 0:
+                                death = new_entry
+                            elif drawn is None:
+                                if best is None or health > best[0]:
+                                    best = new_entry
+                            else:
+                                if next_frontier is None:
+                                    key = (qid, drawn[0], self.room_key(drawn[1], can_run))
+                                    next_frontier = following.setdefault(key, [])
+                                add_to_frontier(next_frontier, new_entry)
+
+            if following:
+                levels.append(following)
+            levels[level_index] = None
+            level_index += 1
+
+        final = best or death
+        return Solution(
+            winnable = best is not None,
+            health = best[0] if best else 0,
+            line = self.line_for_moves(self.moves(final)),
+            nodes = self.nodes,
+        )
+
+    @staticmethod
+    def moves(entry):
+        """
+        Codes played and runs leading to an entry.
+        """
+        moves = []
+        while entry[3] is not None:
+            moves.append(entry[4])
+            entry = entry[3]
+        moves.reverse()
+        return moves
+
+    def line_for_moves(self, moves):
+        """
+        Convert coded moves to choice indexes in the order of
+        Scoundrel.choices_for_turn.
+        """
+        line = []
+        queue = self.queue
+        position, room = draw(queue, 0, ())
+        for move in moves:
+            if move == RUN:
+                line.append(len(room))
+                queue = queue[position:] + room
+                position, room = draw(queue, 0, ())
+            else:
+                index = room.index(move)
+                line.append(index)
+                room = room[:index] + room[index + 1:]
+                if len(room) <= 1:
+                    drawn = draw(queue, position, room)
+                    if drawn is None:
+                        break
+                    position, room = drawn
+        return line
+
+
+def solve_seed(seed, half_monsters=False):
+    """
+    Solve the dungeon runner.run would shuffle for a seed.
+    """
+    dungeon = shuffled_dungeon(game_stream(seed), half_monsters=half_monsters)
+    return Solver(dungeon).solve()
+
+def run(args, stream=None):
+    """
+    Solve seeds from command line arguments, one line per seed.
+    """
+    if stream is None:
+        stream = sys.stdout
+    start = args.seed
+    if start is None:
+        # Seeds are labelled, not played, start from a known seed.
+        start = Solver.default_seed
+    for seed in range(start, start + args.count):
+        solution = solve_seed(seed, half_monsters=args.half_monsters)
+        stream.write(
+            f'{seed} {"winnable" if solution.winnable else "unwinnable"}'
+            f' {solution.health}\n')
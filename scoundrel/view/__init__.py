@@ -1,3 +1,15 @@
-from .pygame import AssetBrowser
-from .pygame import ScoundrelPygame
-from .text import ScoundrelTUI
+import importlib
+
+# Views import their modules on first use, so the text view does not import
+# pygame.
+views = {
+    'AssetBrowser': '.pygame',
+    'ScoundrelPygame': '.pygame',
+    'ScoundrelTUI': '.text',
+}
+
+def __getattr__(name):
+    if name not in views:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    module = importlib.import_module(views[name], __name__)
+    return getattr(module, name)
@@ -2,41 +2,54 @@ from collections import defaultdict
 
 class FrameAnimation:
     """
-    Animation of frame images.
+    Animation of frame images, each shown for frame_duration milliseconds of
+    a clock.
     """
 
     def __init__(self, frames, frame_duration):
         self.frames = frames
         self.frame_duration = frame_duration
-        self.time = 0
-        self.index = 0
 
-    def update(self, elapsed):
-        self.time += elapsed
-        if self.time > self.frame_duration:
-            self.time = 0
-            self.index = (self.index + 1) % len(self.frames)
+    def frame_at(self, clock):
+        """
+        Frame image at clock, in integer milliseconds.
+        """
+        return self.frames[clock // self.frame_duration % len(self.frames)]
 
-    def update_target(self, target):
-        target.image = self.frames[self.index]
+    def time_to_next_frame(self, clock):
+        """
+        Milliseconds from clock until the next frame.
+        """
+        return self.frame_duration - clock % self.frame_duration
 
 
 class AnimationManager:
+    """
+    Animations of sprites driven by one clock, so frames never drift with
+    frame timing and animations sharing a duration change together.
+    """
 
     def __init__(self):
+        self.clock = 0
         self.animations = []
         self.unique_animations = set()
         self.sprite_for_animation = defaultdict(list)
         self.animation_for_sprite = {}
 
-    def update(self, elapsed):
-        # Update animation objects once and sprite targets' images.
-        seen = set()
+    def update(self, elapsed, group=None):
+        """
+        Advance the clock and set the current frame of sprites in group, by
+        default every sprite. Images are only set when the frame changed,
+        so unchanged sprites stay clean for dirty drawing.
+        """
+        self.clock += elapsed
+        clock = self.clock
         for sprite, animation in self.animations:
-            if animation not in seen:
-                seen.add(animation)
-                animation.update(elapsed)
-            animation.update_target(sprite)
+            if group is not None and sprite not in group:
+                continue
+            image = animation.frame_at(clock)
+            if sprite.image is not image:
+                sprite.image = image
 
     def add(self, sprite, animation):
         self.animations.append((sprite, animation))
@@ -44,10 +57,23 @@ class AnimationManager:
         self.sprite_for_animation[animation].append(sprite)
         self.animation_for_sprite[sprite] = animation
 
+    def time_to_next_frame(self, group=None):
+        """
+        Milliseconds until the next frame of any animation with a sprite in
+        group, or None if there are none.
+        """
+        clock = self.clock
+        return min(
+            (
+                animation.time_to_next_frame(clock)
+                for sprite, animation in self.animations
+                if group is None or sprite in group
+            ),
+            default = None,
+        )
+
     def get_sprites_for_animation(self, animation):
-        for sprite, other in self.animations:
-            if other is animation:
-                yield sprite
+        return iter(self.sprite_for_animation[animation])
 
 
 def get_named_animations(assets, frame_duration=200):
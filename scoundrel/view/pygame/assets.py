@@ -1,5 +1,6 @@
 import os
 
+from collections.abc import Mapping
 from configparser import ConfigParser
 from configparser import ExtendedInterpolation
 from itertools import chain
@@ -12,6 +13,7 @@ from scoundrel.suit import Suit
 from scoundrel.util import human_split
 from scoundrel.view.pygame.rect_grid import RectGrid
 
+from . import tile_cache
 from .util import strip_alpha
 
 class Assets:
@@ -40,11 +42,43 @@ class Assets:
 
     @classmethod
     def from_config(cls, section):
-        path = section['path']
-        sheet_image = pygame.image.load(path)
+        """
+        Assets of a spritesheet section, from the tile cache unless the
+        section sets cache = false.
+        """
         rect_grid = RectGrid.from_config(section)
         scale = int(section.get('scale', '1'))
         grid = eval(section['types'])
+        # Strictly one tile per type name.
+        if len(set(grid)) != len(grid):
+            raise KeyError(f'duplicate types in {section.name}')
+        use_cache = section.getboolean('cache', True)
+
+        tiles = None
+        if use_cache:
+            tiles = tile_cache.load_tiles(section)
+        if tiles is None:
+            sheet_image = pygame.image.load(section['path'])
+            tiles = cls.cut_tiles(sheet_image, section, rect_grid, scale, len(grid))
+            if use_cache:
+                tile_cache.save_tiles(section, tiles)
+        else:
+            # Only the tiles were cached.
+            sheet_image = None
+        if len(tiles) < len(grid):
+            raise ValueError(
+                f'{section.name} has {len(tiles)} tiles for {len(grid)} types')
+        assets = dict(zip(grid, tiles))
+
+        # Instantiate and return class.
+        instance = cls(sheet_image, assets, scale, rect_grid)
+        return instance
+
+    @staticmethod
+    def cut_tiles(sheet_image, section, rect_grid, scale, count):
+        """
+        Cut, strip and scale up to count tiles from a sheet image.
+        """
         strip = section.getboolean('strip')
         container = section.get('container', None)
         if isinstance(container, str):
@@ -57,22 +91,19 @@ class Assets:
         else:
             subrects = rect_grid.iter_rects(container)
 
-        assets = {}
-        for key, subrect in zip(grid, subrects):
+        tiles = []
+        for _, subrect in zip(range(count), subrects):
             tile_image = sheet_image.subsurface(subrect).copy()
 
             if strip:
                 tile_image = strip_alpha(tile_image)
 
-            if scale > 1:
+            if scale > 1 and tile_image is not None:
                 subrect = pygame.Rect(subrect)
                 size = tuple(map(lambda d: d * scale, subrect.size))
                 tile_image = pygame.transform.scale(tile_image, size)
-            assets[key] = tile_image
-
-        # Instantiate and return class.
-        instance = cls(sheet_image, assets, scale, rect_grid)
-        return instance
+            tiles.append(tile_image)
+        return tiles
 
     @classmethod
     def from_config_many(cls, cp, suffixes, prefix=None):
@@ -89,17 +120,113 @@ class Assets:
             yield (suffix, instance)
 
 
-def scoundrel_assets_from_config(cp):
-    # Strictly build a dictionary from the suffixes referencing other sections
-    # in the config. Raise for existing keys.
-    assets = {}
-    suffixes = human_split(cp['pygame_user_interface']['spritesheets'])
-    for suffix, assets_instance in Assets.from_config_many(cp, suffixes):
-        if suffix not in assets:
-            assets[suffix] = {}
-        # Strictly update dict.
-        for key, image in assets_instance.images.items():
-            if key in assets[suffix]:
-                raise KeyError
-            assets[suffix][key] = image
+class LazyAssets(Mapping):
+    """
+    Read-only mapping of spritesheet suffix to its dict of images, like the
+    nested dict of every sheet, that loads a sheet on first access or in the
+    background.
+    """
+
+    def __init__(self, cp, suffixes, prefix=None):
+        if prefix is None:
+            prefix = Assets.default_prefix
+        self.cp = cp
+        self.prefix = prefix
+        # Strictly one sheet per suffix.
+        if len(set(suffixes)) != len(suffixes):
+            raise KeyError
+        self.suffixes = list(suffixes)
+        self.loaded = {}
+        # Futures of sheets loading in the background.
+        self.pending = {}
+
+    def load_sheet(self, suffix):
+        section = self.cp[f'{self.prefix}{suffix}']
+        return Assets.from_config(section).images
+
+    def __getitem__(self, suffix):
+        images = self.loaded.get(suffix)
+        if images is None:
+            if suffix not in self.suffixes:
+                raise KeyError(suffix)
+            future = self.pending.pop(suffix, None)
+            if future is None:
+                images = self.load_sheet(suffix)
+            else:
+                # Wait for the background load.
+                images = future.result()
+            self.loaded[suffix] = images
+        return images
+
+    def __iter__(self):
+        return iter(self.suffixes)
+
+    def __len__(self):
+        return len(self.suffixes)
+
+    def __contains__(self, suffix):
+        # Without loading the sheet.
+        return suffix in self.suffixes
+
+    def prefetch(self, suffixes=None):
+        """
+        Load sheets now, by default all of them.
+        """
+        if suffixes is None:
+            suffixes = self.suffixes
+        for suffix in suffixes:
+            self[suffix]
+        return self
+
+    def load_in_background(self, executor, suffixes=None):
+        """
+        Submit loading sheets, by default all of them, to an executor. Image
+        loading and scaling release the GIL so sheets load in parallel with
+        threads.
+        """
+        if suffixes is None:
+            suffixes = self.suffixes
+        for suffix in suffixes:
+            if suffix not in self.loaded and suffix not in self.pending:
+                self.pending[suffix] = executor.submit(self.load_sheet, suffix)
+        return self
+
+    def is_loaded(self, suffix):
+        future = self.pending.get(suffix)
+        if future is None:
+            return suffix in self.loaded
+        return future.done()
+
+    def is_ready(self, suffixes):
+        """
+        True if none of the sheets is still loading in the background.
+        """
+        return all(
+            self.pending[suffix].done()
+            for suffix in suffixes
+            if suffix in self.pending
+        )
+
+    def progress(self):
+        """
+        Tuple of sheets loaded and total sheets.
+        """
+        done = sum(self.is_loaded(suffix) for suffix in self.suffixes)
+        return (done, len(self.suffixes))
+
+
+def scoundrel_assets_from_config(cp, executor=None):
+    """
+    Lazy assets of the sheets listed in spritesheets, loading the sheets
+    listed in the optional prefetch now. With an executor every sheet loads
+    in the background instead, prefetched sheets first.
+    """
+    section = cp['pygame_user_interface']
+    assets = LazyAssets(cp, human_split(section['spritesheets']))
+    prefetch = human_split(section.get('prefetch', ''))
+    if executor is None:
+        assets.prefetch(prefetch)
+    else:
+        assets.load_in_background(executor, prefetch)
+        assets.load_in_background(executor)
     return assets
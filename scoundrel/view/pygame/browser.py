@@ -10,7 +10,9 @@ from scoundrel.rank import Rank
 from scoundrel.suit import Suit
 from scoundrel.view.pygame import layout
 from scoundrel.view.pygame.assets import Assets
+from scoundrel.view.pygame.hit_grid import HitGrid
 from scoundrel.view.pygame.rect_grid import RectGrid
+from scoundrel.view.pygame.text import render_text
 from scoundrel.util import human_split
 
 class AssetBrowser:
@@ -30,20 +32,27 @@ class AssetBrowser:
         parser.add_argument(
             '--config',
         )
-        parser.set_defaults(func=cls.from_args)
+        parser.set_defaults(func=cls.run_from_args)
 
     @classmethod
     def from_args(cls, args):
         assets = Assets.from_args(args)
         return cls(assets)
 
+    @classmethod
+    def run_from_args(cls, args):
+        """
+        Browse the spritesheet section from command line arguments.
+        """
+        return cls.from_args(args).run()
+
     def make_group(self, window, with_font=None):
         text_images = {}
         widest_text = 0
 
         if with_font:
             for key, image in self.assets.images.items():
-                text_images[key] = with_font.render(f'{key}', True, 'purple')
+                text_images[key] = render_text(with_font, f'{key}', 'purple')
             text_rects = {
                 key: text_image.get_rect()
                 for key, text_image in zip(self.assets.images.keys(), text_images.values())
@@ -76,7 +85,7 @@ class AssetBrowser:
 
             if with_font:
                 text_sprite = pygame.sprite.Sprite(group)
-                text_sprite.image = with_font.render(f'{key}', True, 'purple')
+                text_sprite.image = text_images[key]
                 text_sprite.rect = text_sprite.image.get_rect(midtop=tile_sprite.rect.midbottom)
 
         return group
@@ -93,20 +102,34 @@ class AssetBrowser:
         ui_font = pygame.font.Font(None, 24)
         group = self.make_group(window, ui_font)
 
-        offset = pygame.Vector2(0, 0)
+        # Index tiles and labels to draw only those in view.
+        grid = HitGrid(cell_size=256)
+        for sprite in group:
+            grid.add(sprite)
+
+        offset_x = offset_y = 0
+        needs_draw = True
         running = True
         while running:
-            for event in pygame.event.get():
+            # Nothing moves unless dragged, sleep until an event.
+            for event in [pygame.event.wait()] + pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
                 elif event.type == pygame.MOUSEMOTION:
                     if event.buttons[0]:
-                        offset += event.rel
-
-            display.fill('black')
-            for sprite in group:
-                display.blit(sprite.image, sprite.rect.move(offset))
-
-            pygame.display.update()
+                        offset_x += event.rel[0]
+                        offset_y += event.rel[1]
+                        needs_draw = True
+                elif event.type == pygame.WINDOWEXPOSED:
+                    needs_draw = True
+
+            if needs_draw:
+                display.fill('black')
+                viewport = window.move(-offset_x, -offset_y)
+                for sprite in grid.intersecting(viewport):
+                    rect = sprite.rect
+                    display.blit(sprite.image, (rect.x + offset_x, rect.y + offset_y))
+                pygame.display.update()
+                needs_draw = False
 
             clock.tick(60)
@@ -0,0 +1,97 @@
+from functools import lru_cache
+from itertools import product
+
+from scoundrel.external import pygame
+from scoundrel.rank import Rank
+from scoundrel.suit import Suit
+
+from .polygon_group import PolygonGroup
+from .shape import create_club_points_groups
+from .shape import create_diamond_points
+from .shape import create_heart_points
+from .shape import create_spade_points_groups
+
+rank_labels = {
+    Rank.ACE: 'A',
+    Rank.JACK: 'J',
+    Rank.QUEEN: 'Q',
+    Rank.KING: 'K',
+}
+
+def rank_label(rank):
+    return rank_labels.get(rank, str(rank.value))
+
+def suit_color(suit):
+    if suit in (Suit.HEARTS, Suit.DIAMONDS):
+        return 'firebrick'
+    return 'black'
+
+@lru_cache(maxsize=64)
+def suit_polygons(suit, size):
+    """
+    Polygon point groups of a suit symbol in a rect of size. Cached, the
+    points take trigonometry to make.
+    """
+    if suit == Suit.HEARTS:
+        groups = [create_heart_points(size)]
+    elif suit == Suit.DIAMONDS:
+        groups = [create_diamond_points(size)]
+    elif suit == Suit.CLUBS:
+        groups = create_club_points_groups(size)
+    else:
+        groups = create_spade_points_groups(size)
+    return tuple(tuple(points) for points in groups)
+
+@lru_cache(maxsize=16)
+def rank_font(height):
+    return pygame.font.Font(None, height)
+
+def draw_suit(surface, suit, rect):
+    """
+    Draw a suit symbol centered in rect.
+    """
+    group = PolygonGroup(suit_polygons(suit, rect.size))
+    x, y, width, height = group.bounding()
+    offset_x = rect.centerx - (x + width / 2)
+    offset_y = rect.centery - (y + height / 2)
+    PolygonGroup(group.move(offset_x, offset_y)).draw(surface, suit_color(suit))
+
+@lru_cache(maxsize=256)
+def render_card_face(suit, rank, size):
+    """
+    Surface of a card face of size, the rank in the corner over a small
+    suit and a large suit in the middle. Cached, blit it but do not draw on
+    it.
+    """
+    width, height = size
+    surface = pygame.Surface(size, pygame.SRCALPHA)
+    rect = surface.get_rect()
+    radius = max(width // 10, 1)
+    pygame.draw.rect(surface, 'white', rect, border_radius=radius)
+    pygame.draw.rect(surface, 'gray30', rect, max(width // 32, 1), border_radius=radius)
+
+    margin = max(width // 16, 1)
+    font = rank_font(max(height // 4, 8))
+    text_image = font.render(rank_label(rank), True, suit_color(suit))
+    text_rect = text_image.get_rect(topleft=(margin * 2, margin))
+    surface.blit(text_image, text_rect)
+
+    pip_size = max(width // 5, 4)
+    pip_rect = pygame.Rect(0, 0, pip_size, pip_size)
+    pip_rect.midtop = (text_rect.centerx, text_rect.bottom)
+    draw_suit(surface, suit, pip_rect)
+
+    symbol_size = width // 2
+    symbol_rect = pygame.Rect(0, 0, symbol_size, symbol_size)
+    symbol_rect.center = (rect.centerx, rect.centery + height // 10)
+    draw_suit(surface, suit, symbol_rect)
+    return surface
+
+def card_face_images(size):
+    """
+    Card faces of size keyed like the smallcards spritesheet.
+    """
+    return {
+        (suit, rank): render_card_face(suit, rank, size)
+        for suit, rank in product(Suit, Rank.list_from_ace())
+    }
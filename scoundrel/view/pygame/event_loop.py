@@ -1,8 +1,14 @@
+import math
+
 from scoundrel.external import pygame
 
-def run(event_handler, tick, update, draw):
+def run(event_handler, tick, update, draw, time_to_next_frame=None):
     """
     pygame loop until event_handler returns anything but None.
+
+    time_to_next_frame returns the milliseconds until the display changes on
+    its own, or None if only events change it. When given, the loop sleeps
+    on the event queue until then instead of drawing every tick.
     """
     while True:
         for event in pygame.event.get():
@@ -12,5 +18,22 @@ def run(event_handler, tick, update, draw):
 
         elapsed = tick()
         update(elapsed)
+        # draw updates the display.
         draw()
-        pygame.display.update()
+
+        if time_to_next_frame is not None:
+            timeout = time_to_next_frame()
+            if timeout is None:
+                event = pygame.event.wait()
+                # Nothing was animating, the idle time is not elapsed time
+                # of the next update.
+                tick()
+            elif timeout > 0:
+                # wait takes whole milliseconds, do not wake before the frame.
+                event = pygame.event.wait(math.ceil(timeout))
+            else:
+                continue
+            if event.type != pygame.NOEVENT:
+                result = event_handler(event)
+                if result is not None:
+                    return result
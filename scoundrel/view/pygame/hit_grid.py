@@ -0,0 +1,104 @@
+from collections import defaultdict
+from itertools import count
+
+from scoundrel.external import pygame
+
+class HitGrid:
+    """
+    Uniform grid of sprite rects. A hit test only looks at the sprites
+    overlapping the cell of the point, however many sprites there are.
+    """
+
+    default_cell_size = 64
+
+    def __init__(self, cell_size=None):
+        if cell_size is None:
+            cell_size = self.default_cell_size
+        self.cell_size = cell_size
+        self.cells = defaultdict(set)
+        # Rect each sprite is indexed by and its order added, for z-order.
+        self.rects = {}
+        self.order = {}
+        self.counter = count()
+
+    def cells_for_rect(self, rect):
+        if rect.width <= 0 or rect.height <= 0:
+            return
+        size = self.cell_size
+        for x in range(rect.left // size, (rect.right - 1) // size + 1):
+            for y in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                yield (x, y)
+
+    def _insert(self, sprite):
+        rect = self.rects[sprite] = pygame.Rect(sprite.rect)
+        for cell in self.cells_for_rect(rect):
+            self.cells[cell].add(sprite)
+
+    def _discard(self, sprite):
+        rect = self.rects.pop(sprite)
+        for cell in self.cells_for_rect(rect):
+            sprites = self.cells[cell]
+            sprites.discard(sprite)
+            if not sprites:
+                del self.cells[cell]
+
+    def add(self, sprite):
+        if sprite in self.rects:
+            return
+        self.order[sprite] = next(self.counter)
+        self._insert(sprite)
+
+    def remove(self, sprite):
+        if sprite not in self.rects:
+            return
+        self._discard(sprite)
+        del self.order[sprite]
+
+    def move(self, sprite):
+        """
+        Reindex a sprite whose rect changed.
+        """
+        if sprite in self.rects and self.rects[sprite] != sprite.rect:
+            self._discard(sprite)
+            self._insert(sprite)
+
+    def z_key(self, sprite):
+        return (getattr(sprite, 'layer', 0), self.order[sprite])
+
+    def hits(self, point, predicate=None):
+        """
+        Sprites whose rect contains point, topmost first, optionally only
+        those predicate is true for.
+        """
+        x, y = point
+        cell = (int(x) // self.cell_size, int(y) // self.cell_size)
+        hits = [
+            sprite for sprite in self.cells.get(cell, ())
+            if self.rects[sprite].collidepoint(point)
+            and (predicate is None or predicate(sprite))
+        ]
+        hits.sort(key=self.z_key, reverse=True)
+        return hits
+
+    def intersecting(self, rect):
+        """
+        Sprites whose rect overlaps rect, bottommost first for drawing.
+        """
+        rect = pygame.Rect(rect)
+        found = set()
+        for cell in self.cells_for_rect(rect):
+            found.update(self.cells.get(cell, ()))
+        sprites = [
+            sprite for sprite in found
+            if self.rects[sprite].colliderect(rect)
+        ]
+        sprites.sort(key=self.z_key)
+        return sprites
+
+    def hit(self, point, predicate=None):
+        """
+        Topmost sprite at point, or None.
+        """
+        hits = self.hits(point, predicate)
+        if hits:
+            return hits[0]
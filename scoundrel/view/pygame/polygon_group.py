@@ -1,4 +1,4 @@
-import pygame
+from scoundrel.external import pygame
 
 from .shape import bounding
 from .shape import move_points
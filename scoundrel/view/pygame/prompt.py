@@ -34,6 +34,7 @@ class PromptTurn:
                 self.user_interface.tick,
                 self.update,
                 self.user_interface.draw,
+                self.user_interface.time_to_next_frame,
             )
             if result is not None:
                 return result
@@ -50,9 +51,15 @@ class PromptQuit:
             return QuitPrompt.QUIT
         elif event.type == pygame.MOUSEBUTTONDOWN:
             if event.button == pygame.BUTTON_LEFT:
-                for sprite in self.user_interface.quit_prompt_sprites:
-                    if sprite.rect.collidepoint(event.pos):
-                        return sprite.value
+                sprite = self.user_interface.sprites.get_sprite_at(
+                    event.pos,
+                    self.is_quit_sprite,
+                )
+                if sprite:
+                    return sprite.value
+
+    def is_quit_sprite(self, sprite):
+        return sprite in self.user_interface.quit_prompt_sprites
 
     def update(self, elapsed):
         self.user_interface.update(elapsed, self.game)
@@ -64,6 +71,17 @@ class PromptQuit:
                 self.user_interface.tick,
                 self.update,
                 self.user_interface.draw,
+                self.user_interface.time_to_next_frame,
             )
             if result is not None:
                 return result
+
+
+class PromptGameOver(PromptQuit):
+    """
+    Show the end of the game until the window is closed.
+    """
+
+    def event_handler(self, event):
+        if event.type == pygame.QUIT:
+            return QuitPrompt.QUIT
@@ -1,22 +1,157 @@
+from collections import defaultdict
+from heapq import heappop
+from heapq import heappush
+
 class Relationship:
+    """
+    Keep sprite2 placed relative to sprite1 with func(sprite1, sprite2).
+    """
 
     def __init__(self, sprite1, sprite2, func):
         self.sprite1 = sprite1
         self.sprite2 = sprite2
         self.func = func
 
+    @property
+    def source(self):
+        return self.sprite1
+
+    @property
+    def target(self):
+        return self.sprite2
+
     def update(self):
         return self.func(self.sprite1, self.sprite2)
 
 
+class RelationshipCycle(ValueError):
+    """
+    A relationship would make rects follow themselves.
+    """
+
+
 class RelationshipManager:
+    """
+    Relationships as a graph from each source to the targets following it.
+    Updates apply only the relationships downstream of something that moved,
+    in topological order so each applies once per update. A target moved by
+    something else is put back by its relationships.
+    """
 
     def __init__(self):
         self.relationships = []
+        # id of source to the relationships following it. Rects are
+        # unhashable, the relationships keep them alive.
+        self.dependents = defaultdict(list)
+        # id of target to the relationships placing it.
+        self.placing = defaultdict(list)
+        # Relationships appended since the last update.
+        self.added = []
+        # Topological rank of each relationship by id, None when stale.
+        self.ranks = None
+        self.by_id = {}
+        self.rects = []
+        # id of rect to its value when last propagated.
+        self.last = {}
+
+    def reaches(self, start, goal):
+        """
+        True if moving rect start moves rect goal.
+        """
+        stack = [start]
+        seen = set()
+        while stack:
+            rect = stack.pop()
+            if rect is goal:
+                return True
+            if id(rect) in seen:
+                continue
+            seen.add(id(rect))
+            for relationship in self.dependents.get(id(rect), ()):
+                stack.append(relationship.target)
+        return False
 
     def append(self, relationship):
+        if self.reaches(relationship.target, relationship.source):
+            raise RelationshipCycle(
+                f'{relationship.target} already moves {relationship.source}')
         self.relationships.append(relationship)
+        self.dependents[id(relationship.source)].append(relationship)
+        self.placing[id(relationship.target)].append(relationship)
+        self.added.append(relationship)
+        self.ranks = None
 
-    def update(self):
+    def sort(self):
+        """
+        Rank relationships so every relationship comes after those moving
+        its source.
+        """
+        indegree = defaultdict(int)
+        rects = {}
         for relationship in self.relationships:
+            rects[id(relationship.source)] = relationship.source
+            rects[id(relationship.target)] = relationship.target
+            indegree[id(relationship.target)] += 1
+
+        ready = [key for key in rects if not indegree[key]]
+        ranks = {}
+        while ready:
+            key = ready.pop()
+            for relationship in self.dependents.get(key, ()):
+                ranks[id(relationship)] = len(ranks)
+                target = id(relationship.target)
+                indegree[target] -= 1
+                if not indegree[target]:
+                    ready.append(target)
+
+        self.ranks = ranks
+        self.by_id = {id(relationship): relationship for relationship in self.relationships}
+        self.rects = list(rects.values())
+
+    def update(self, moved=None):
+        """
+        Apply the relationships of rects that moved and of the rects those
+        move in turn, and of new relationships. moved is the rects known to
+        have moved, by default every rect is compared to its value at the last
+        update.
+        """
+        if self.ranks is None:
+            self.sort()
+        if moved is None:
+            moved = [
+                rect for rect in self.rects
+                if tuple(rect) != self.last.get(id(rect))
+            ]
+
+        ranks = self.ranks
+        heap = []
+        queued = set()
+
+        def push(relationships):
+            for relationship in relationships:
+                key = id(relationship)
+                if key not in queued:
+                    queued.add(key)
+                    heappush(heap, (ranks[key], key))
+
+        def push_dependents(rect):
+            push(self.dependents.get(id(rect), ()))
+
+        push(self.added)
+        self.added = []
+        for rect in moved:
+            self.last[id(rect)] = tuple(rect)
+            push_dependents(rect)
+            # A moved target goes back where its relationships place it.
+            push(self.placing.get(id(rect), ()))
+
+        while heap:
+            _, key = heappop(heap)
+            relationship = self.by_id[key]
+            target = relationship.target
+            before = tuple(target)
             relationship.update()
+            after = tuple(target)
+            self.last[id(target)] = after
+            if after != before:
+                push_dependents(target)
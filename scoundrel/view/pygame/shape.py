@@ -1,12 +1,9 @@
-import contextlib
 import math
 import operator
-import os
 
 from itertools import chain
 
-with contextlib.redirect_stdout(open(os.devnull, 'w')):
-    import pygame
+from scoundrel.external import pygame
 
 def rect_from_size(size):
     return pygame.Rect((0,0), size)
@@ -1,6 +1,9 @@
 from scoundrel.external import pygame
 
-class ScoundrelSprite(pygame.sprite.Sprite):
+from .hit_grid import HitGrid
+from .text import render_text
+
+class ScoundrelSprite(pygame.sprite.DirtySprite):
     """
     A sprite for the scoundrel pygame interface that includes important links
     to game data.
@@ -15,18 +18,71 @@ class ScoundrelSprite(pygame.sprite.Sprite):
         card = None,
         room = None,
     ):
-        super().__init__(*groups)
+        super().__init__()
         self.image = image
         self.rect = rect or self.image.get_rect()
         self.deck = deck
         self.card = card
         self.room = room
+        # Image and rect as last drawn.
+        self.drawn_image = None
+        self.drawn_rect = None
+        # Join groups with a rect to index.
+        self.add(*groups)
+
+    def mark_if_changed(self):
+        """
+        Set dirty if the image or rect changed since last drawn. Return True
+        if the rect moved.
+        """
+        moved = self.rect != self.drawn_rect
+        if moved or self.image is not self.drawn_image:
+            self.dirty = max(self.dirty, 1)
+            self.drawn_image = self.image
+            self.drawn_rect = self.rect.copy()
+        return moved
+
+
+class DirtyGroup(pygame.sprite.LayeredDirty):
+    """
+    LayeredDirty group of ScoundrelSprite that marks sprites changed since
+    they were drawn, so only they and what they overlap are redrawn. Keeps a
+    HitGrid of the sprites as last drawn for hit tests.
+    """
+
+    def __init__(self, *sprites, **kwargs):
+        self.hit_grid = HitGrid()
+        super().__init__(*sprites, **kwargs)
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self.hit_grid.add(sprite)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.hit_grid.remove(sprite)
+
+    def draw(self, surface, bgsurf=None, special_flags=None):
+        """
+        Draw changed sprites and return the rects of the surface to update.
+        """
+        for sprite in self.sprites():
+            if sprite.mark_if_changed():
+                self.hit_grid.move(sprite)
+        return super().draw(surface, bgsurf, special_flags)
+
+    def get_sprite_at(self, point, predicate=None):
+        """
+        Topmost sprite drawn at point, optionally only those predicate is
+        true for.
+        """
+        return self.hit_grid.hit(point, predicate)
 
 
 def create_run_card(size, font, *groups):
     image = pygame.Surface(size)
     run_card = ScoundrelSprite(image, *groups)
-    text_image = font.render('Run', True, 'white')
+    text_image = render_text(font, 'Run', 'white')
     text_rect = text_image.get_rect(center=run_card.rect.center)
     run_card.image.blit(text_image, text_rect)
     return run_card
@@ -42,7 +98,7 @@ def create_text_sprite(
 ):
     if groups is None:
         groups = ()
-    text_image = font.render(text, antialias, color)
+    text_image = render_text(font, text, color, antialias)
     text_rect = text_image.get_rect()
 
     size = tuple(a + b for a, b in zip(text_rect.size, padding))
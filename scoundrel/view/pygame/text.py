@@ -0,0 +1,68 @@
+from collections import OrderedDict
+
+from scoundrel.external import pygame
+
+class TextCache:
+    """
+    Least recently used cache of rendered text surfaces. Cached surfaces are
+    shared, blit them but do not draw on them.
+    """
+
+    default_maxsize = 256
+
+    def __init__(self, maxsize=None):
+        if maxsize is None:
+            maxsize = self.default_maxsize
+        self.maxsize = maxsize
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(font, text, color, antialias):
+        if isinstance(color, pygame.Color):
+            # Color is mutable and unhashable.
+            color = tuple(color)
+        return (font, text, color, antialias)
+
+    def render(self, font, text, color, antialias=True):
+        """
+        Return font.render of the text from the cache, rendering on a miss.
+        """
+        key = self.key(font, text, color, antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.maxsize:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.surfaces)
+
+    def __repr__(self):
+        return (
+            f'{self.__class__.__name__}(size={len(self)}, maxsize={self.maxsize},'
+            f' hits={self.hits}, misses={self.misses})'
+        )
+
+
+# Shared by the pygame views.
+text_cache = TextCache()
+
+def render_text(font, text, color, antialias=True):
+    """
+    Rendered text from the shared cache.
+    """
+    return text_cache.render(font, text, color, antialias)
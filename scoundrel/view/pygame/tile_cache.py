@@ -0,0 +1,155 @@
+import hashlib
+import os
+import struct
+
+from scoundrel.constant import CACHE_KEY
+from scoundrel.external import pygame
+
+MAGIC = b'SCTC\x01'
+
+# Tile count.
+header_struct = struct.Struct('<I')
+
+# Width, height, bytes per pixel (zero for no tile), has colorkey and the
+# colorkey as RGBA.
+tile_struct = struct.Struct('<HHB?4B')
+
+pixel_formats = {
+    3: 'RGB',
+    4: 'RGBA',
+}
+
+def default_cache_dir():
+    """
+    Cache directory from the environment, or the user's cache directory.
+    """
+    path = os.environ.get(CACHE_KEY)
+    if path:
+        return path
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return os.path.join(base, 'scoundrel')
+
+def section_key(section):
+    """
+    Hex digest of a spritesheet section's values and the identity of its
+    source image, its size and modification time.
+    """
+    path = section['path']
+    stat = os.stat(path)
+    values = sorted(
+        (name, section[name]) for name in section if name != 'cache_dir'
+    )
+    data = repr((values, stat.st_size, stat.st_mtime_ns, pygame.version.ver))
+    return hashlib.blake2b(data.encode(), digest_size=16).hexdigest()
+
+def cache_path(section):
+    cache_dir = section.get('cache_dir') or default_cache_dir()
+    return os.path.join(cache_dir, f'{section.name}.{section_key(section)}.tiles')
+
+def encode_tiles(tiles):
+    """
+    Bytes of a list of surfaces, or None for empty tiles, as raw pixels.
+    """
+    parts = [MAGIC, header_struct.pack(len(tiles))]
+    for tile in tiles:
+        if tile is None:
+            parts.append(tile_struct.pack(0, 0, 0, False, 0, 0, 0, 0))
+            continue
+        colorkey = tile.get_colorkey()
+        # Per-pixel alpha is kept with or without a colorkey.
+        if tile.get_flags() & pygame.SRCALPHA:
+            nbytes = 4
+        else:
+            nbytes = 3
+        width, height = tile.get_size()
+        parts.append(tile_struct.pack(
+            width,
+            height,
+            nbytes,
+            colorkey is not None,
+            *(colorkey or (0, 0, 0, 0)),
+        ))
+        if colorkey is not None:
+            # tobytes makes alpha 0 or 255 by the colorkey, keep the pixels.
+            tile = tile.copy()
+            tile.set_colorkey(None)
+        parts.append(pygame.image.tobytes(tile, pixel_formats[nbytes]))
+    return b''.join(parts)
+
+def decode_tiles(data):
+    """
+    List of surfaces from encode_tiles bytes. Surfaces share the pixels of
+    data, which should be a bytearray.
+    """
+    if not data.startswith(MAGIC):
+        raise ValueError('not a tile cache')
+    view = memoryview(data)
+    offset = len(MAGIC)
+    count, = header_struct.unpack_from(data, offset)
+    offset += header_struct.size
+    tiles = []
+    for _ in range(count):
+        width, height, nbytes, has_colorkey, *colorkey = tile_struct.unpack_from(data, offset)
+        offset += tile_struct.size
+        if not nbytes:
+            tiles.append(None)
+            continue
+        size = width * height * nbytes
+        tile = pygame.image.frombuffer(
+            view[offset:offset + size],
+            (width, height),
+            pixel_formats[nbytes],
+        )
+        offset += size
+        if has_colorkey:
+            tile.set_colorkey(colorkey)
+        tiles.append(tile)
+    return tiles
+
+def load_tiles(section):
+    """
+    Cached tiles of a spritesheet section or None if not cached.
+    """
+    try:
+        with open(cache_path(section), 'rb') as cache_file:
+            # One read into the buffer the surfaces keep.
+            data = bytearray(os.fstat(cache_file.fileno()).st_size)
+            cache_file.readinto(data)
+        return decode_tiles(data)
+    except (OSError, ValueError, struct.error):
+        return
+
+def save_tiles(section, tiles):
+    """
+    Cache tiles of a spritesheet section. The cache is an optimization,
+    failing to write it is not an error.
+    """
+    path = cache_path(section)
+    temp_path = f'{path}.{os.getpid()}'
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(temp_path, 'wb') as cache_file:
+            cache_file.write(encode_tiles(tiles))
+        # Readers see the whole file or none.
+        os.replace(temp_path, path)
+        remove_stale(path, section)
+    except (OSError, ValueError, struct.error, pygame.error):
+        # Tiles the format cannot hold, like sizes over 65535, stay uncached.
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+def remove_stale(path, section):
+    """
+    Remove cache files of older versions of a section.
+    """
+    cache_dir, name = os.path.split(path)
+    prefix = f'{section.name}.'
+    for other in os.listdir(cache_dir):
+        if other == name or not other.endswith('.tiles'):
+            continue
+        # Only this section's names, prefix, hex digest and suffix.
+        digest = other[len(prefix):-len('.tiles')]
+        if other.startswith(prefix) and digest.isalnum():
+            os.remove(os.path.join(cache_dir, other))
@@ -1,6 +1,6 @@
 import os
-import random
 
+from concurrent.futures import ThreadPoolExecutor
 from configparser import ConfigParser
 from configparser import ExtendedInterpolation
 from enum import IntEnum
@@ -23,16 +23,37 @@ from scoundrel.util import letter_indexer
 
 from .animation import AnimationManager
 from .animation import get_named_animations
+from .assets import LazyAssets
 from .assets import scoundrel_assets_from_config
+from .card_face import card_face_images
 from .layout import move_as_group
+from .prompt import PromptGameOver
 from .prompt import PromptQuit
 from .prompt import PromptTurn
 from .quit_prompt import QuitPrompt
 from .relationship import Relationship
 from .relationship import RelationshipManager
+from .sprite import DirtyGroup
 from .sprite import ScoundrelSprite
 from .sprite import create_run_card
 from .sprite import create_text_sprite
+from .text import render_text
+
+def is_room_sprite(sprite):
+    return sprite.deck == Deck.ROOM
+
+def moved_by_layout(layout, rects):
+    """
+    Apply layout to rects, which may include None, and return the rects it
+    moved.
+    """
+    before = [tuple(rect) if rect is not None else None for rect in rects]
+    layout(rects)
+    return [
+        rect for rect, old in zip(rects, before)
+        if rect is not None and tuple(rect) != old
+    ]
+
 
 class ScoundrelPygame:
     """
@@ -44,6 +65,11 @@ class ScoundrelPygame:
     default_message_generator_class = ScoundrelMessage
     default_menu_class = ChooseMenu
     default_messages_length = 5
+    # Size of drawn card faces, without a smallcards spritesheet.
+    default_card_size = (64, 88)
+
+    # Sheets the room needs before the game is interactive.
+    required_sheets = ('smallcards', 'suits', 'new_platformer_pack')
 
     def __init__(
         self,
@@ -53,6 +79,7 @@ class ScoundrelPygame:
         message_generator_class = None,
         menu_class = None,
         messages_length = None,
+        card_size = None,
     ):
         self.assets = assets
 
@@ -76,6 +103,10 @@ class ScoundrelPygame:
             messages_length = self.default_messages_length
         self.messages_length = messages_length
 
+        if card_size is None:
+            card_size = self.default_card_size
+        self.card_size = card_size
+
     @classmethod
     def add_subparser(cls, subparsers):
         """
@@ -90,42 +121,48 @@ class ScoundrelPygame:
         )
         subparser.add_argument(
             '--framerate',
-            type = int,
+            type = parse.positive_int,
             default = cls.default_framerate,
             help = 'Frames per second. Default: %(default)s',
         )
+        subparser.add_argument(
+            '--card-size',
+            type = parse.size,
+            default = cls.default_card_size,
+            help = 'Size of drawn card faces without a smallcards'
+                ' spritesheet. Default: %(default)s',
+        )
         subparser.add_argument(
             '--config',
             help = 'Path to config.'
         )
+        runner.add_arguments(subparser)
         subparser.set_defaults(
             func = runner.run,
             view_class = cls.from_args,
         )
 
-    @staticmethod
-    def validate_args(args):
-        if args.framerate < 1:
-            raise ValueError('--frame-rate must be positive.')
-
     @classmethod
     def from_args(cls, args):
         """
         Scoundrel pygame interface from command line arguments.
         """
-        cls.validate_args(args)
-
         cp = ConfigParser(
             interpolation = ExtendedInterpolation(),
         )
         cp.read(args.config or os.environ.get(CONFIG_KEY))
 
-        assets = scoundrel_assets_from_config(cp)
+        # Load sheets while the window opens. Submitted loads still run
+        # after shutdown.
+        executor = ThreadPoolExecutor()
+        assets = scoundrel_assets_from_config(cp, executor)
+        executor.shutdown(wait=False)
 
         instance = cls(
             display_size = args.display_size,
             framerate = args.framerate,
             assets = assets,
+            card_size = args.card_size,
         )
         return instance
 
@@ -133,9 +170,43 @@ class ScoundrelPygame:
         pygame.font.init()
         self.display_surface = pygame.display.set_mode(self.display_size)
         self.display_rect = self.display_surface.get_rect()
+        self.background = pygame.Surface(self.display_size)
+        self.background.fill('black')
+        self.display_surface.blit(self.background, (0, 0))
         self.clock = pygame.time.Clock()
         self.ui_font = pygame.font.Font(None, 32)
 
+    def wait_for_assets(self, suffixes):
+        """
+        Show loading progress until sheets are loaded. Return False if the
+        window was closed first.
+        """
+        if not isinstance(self.assets, LazyAssets):
+            return True
+
+        bar = pygame.Rect(0, 0, self.display_rect.width // 2, 24)
+        bar.center = self.display_rect.center
+        text_image = render_text(self.ui_font, 'Loading', 'white')
+        text_rect = text_image.get_rect(midbottom=bar.move(0, -8).midtop)
+        while not self.assets.is_ready(suffixes):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    return False
+
+            done, total = self.assets.progress()
+            fill = bar.inflate(-6, -6)
+            fill.width = fill.width * done // total
+            self.display_surface.blit(self.background, (0, 0))
+            self.display_surface.blit(text_image, text_rect)
+            pygame.draw.rect(self.display_surface, 'white', bar, 2)
+            pygame.draw.rect(self.display_surface, 'white', fill)
+            pygame.display.update()
+            self.clock.tick(self.framerate)
+
+        self.display_surface.blit(self.background, (0, 0))
+        pygame.display.update()
+        return True
+
     def init_listeners(self, game):
         game.on(Event.HEAL, self.dispatch_flash)
         game.on(Event.PLAYER_DAMAGE, self.dispatch_flash)
@@ -150,11 +221,7 @@ class ScoundrelPygame:
         image = self.assets['suits']['hearts']
         rect = image.get_rect()
         for _ in range(Scoundrel.MAX_HEALTH):
-            sprite = pygame.sprite.Sprite(self.sprites)
-            sprite.image = image
-            sprite.rect = rect.copy()
-            sprite.deck = None
-            sprite.card = None
+            sprite = ScoundrelSprite(image, self.sprites, rect=rect.copy())
             self.health_sprites.append(sprite)
 
         self.health_layout = FlexLayout.from_columns(
@@ -195,13 +262,14 @@ class ScoundrelPygame:
 
     def init_card_sprites(self, game):
         self.sprite_for_card = {}
+        rng = game.rng.spawn('view', 'animations')
         for card in game.decks['dungeon']:
-            image = self.assets['smallcards'][(card.suit, card.rank)]
+            image = self.card_images[(card.suit, card.rank)]
             card_sprite = ScoundrelSprite(image, card=card)
             card_sprite.animated_sprite = None
             self.sprite_for_card[card] = card_sprite
             if card.is_monster:
-                animation = random.choice(list(self.named_animations.values()))
+                animation = rng.choice(list(self.named_animations.values()))
                 card_sprite.animated_sprite = ScoundrelSprite(animation.frames[0])
                 self.animation_manager.add(card_sprite.animated_sprite, animation)
                 align_monster_to_card = AlignRelationship(
@@ -244,16 +312,22 @@ class ScoundrelPygame:
         Initialize interface against game instance.
         """
         self.init_pygame()
+        if not self.wait_for_assets(self.required_sheets):
+            game.quit()
+            return
 
+        self.card_images = self.get_card_images()
         self.animation_manager = AnimationManager()
         self.named_animations = get_named_animations(self.assets)
 
         self.relationship_manager = RelationshipManager()
 
         self.message_list = []
-        self.sprites = pygame.sprite.Group()
+        self.messages_changed = False
+        self.sprites = DirtyGroup()
+        self.sprites.clear(self.display_surface, self.background)
 
-        reference_rect = self.assets['smallcards'][(Suit.DIAMONDS, Rank.ACE)].get_rect()
+        reference_rect = self.card_images[(Suit.DIAMONDS, Rank.ACE)].get_rect()
         self.run_card = create_run_card(reference_rect.size, self.ui_font)
 
         self.init_quit_sprites()
@@ -262,6 +336,15 @@ class ScoundrelPygame:
         self.init_layouts(reference_rect)
         self.init_listeners(game)
 
+    def get_card_images(self):
+        """
+        Card faces from the smallcards spritesheet, or drawn at card_size
+        without one.
+        """
+        if 'smallcards' in self.assets:
+            return self.assets['smallcards']
+        return card_face_images(self.card_size)
+
     def dispatch_flash(self, event_name, game, **kwargs):
         """
         Display whatever message lines
@@ -300,11 +383,13 @@ class ScoundrelPygame:
                 self.sprites.remove(card_sprite.animated_sprite)
 
     def flash(self, message):
-        image = self.ui_font.render(message, True, 'white')
-        self.message_list.append((image, image.get_rect()))
+        image = render_text(self.ui_font, message, 'white')
+        self.message_list.append(ScoundrelSprite(image, self.sprites))
         if len(self.message_list) > self.messages_length:
             # Keep last three
+            self.sprites.remove(self.message_list[:-self.messages_length])
             self.message_list = self.message_list[-self.messages_length:]
+        self.messages_changed = True
 
     def update_health_sprites(self, health_count):
         """
@@ -336,51 +421,64 @@ class ScoundrelPygame:
                 sprite.deck = Deck.ROOM
                 self.sprites.add(sprite)
         rects = [sprite.rect if sprite else None for sprite in sprites]
-        self.room_layout(rects)
+        return moved_by_layout(self.room_layout, rects)
 
     def layout_battlefield(self, game):
         rects = [self.sprite_for_card[card].rect for card in game.decks['battlefield']]
-        self.battlefield_layout(rects)
+        return moved_by_layout(self.battlefield_layout, rects)
+
+    def layout_turn(self, game, available_choices):
+        """
+        Place the cards of a turn and what follows them.
+        """
+        self.room_menu.update_for_available(available_choices)
+        moved = self.layout_room_cards(available_choices)
+        moved += self.layout_battlefield(game)
+        self.relationship_manager.update(moved=moved)
 
     def update(self, elapsed, game):
-        self.animation_manager.update(elapsed)
+        # Sprites off the display catch up when they are added back.
+        self.animation_manager.update(elapsed, self.sprites)
         self.update_health_sprites(game.health)
 
     def render_messages(self):
         """
-        Render text messages from bottom-up.
+        Layout text message sprites from bottom-up, if they changed.
         """
-        rects = [rect for image, rect in self.message_list]
+        if not self.messages_changed:
+            return
+        rects = [sprite.rect for sprite in self.message_list]
         self.message_layout(rects)
-        for image, rect in self.message_list:
-            self.display_surface.blit(image, rect)
+        self.messages_changed = False
 
     def draw(self):
-        self.display_surface.fill('black')
+        """
+        Draw what changed and update only those areas of the display.
+        """
         self.render_messages()
-        self.sprites.draw(self.display_surface)
-        pygame.display.update()
+        dirty_rects = self.sprites.draw(self.display_surface)
+        if dirty_rects:
+            pygame.display.update(dirty_rects)
 
     def get_click_card(self, point):
-        for sprite in self.sprites:
-            if (
-                sprite.deck == Deck.ROOM
-                and sprite.rect.collidepoint(point)
-            ):
-                return sprite
+        return self.sprites.get_sprite_at(point, is_room_sprite)
 
     def tick(self):
         return self.clock.tick(self.framerate)
 
+    def time_to_next_frame(self):
+        """
+        Milliseconds until an animation on display changes, None for a still
+        display.
+        """
+        return self.animation_manager.time_to_next_frame(self.sprites)
+
     def prompt_for_turn(self, game, available_choices):
         """
         Prompt to select card from room.
         """
         # Setup for loop
-        self.room_menu.update_for_available(available_choices)
-        self.layout_room_cards(available_choices)
-        self.layout_battlefield(game)
-        self.relationship_manager.update()
+        self.layout_turn(game, available_choices)
         self.highlight = None
 
         # Loop until we get QUIT or a card.
@@ -407,9 +505,4 @@ class ScoundrelPygame:
         return result
 
     def on_game_over(self, event_name, game):
-        running = True
-        while running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-            pygame.display.update()
+        PromptGameOver(self, game).run()
@@ -32,6 +32,7 @@ class ScoundrelTUI(ViewBase):
             default = 'stdout',
             help = 'Text stream output. Default: %(default)s',
         )
+        runner.add_arguments(text_subparser)
         text_subparser.set_defaults(
             func = runner.run,
             view_class = cls.from_args,